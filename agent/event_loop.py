@@ -0,0 +1,22 @@
+"""
+Event loop entry point for the pipeline scripts.
+
+uvloop is used when installed; the stdlib asyncio loop is the fallback.
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on a fresh event loop, like asyncio.run."""
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -0,0 +1,44 @@
+"""
+Shared Gemini client.
+
+Every script talks to the same API host, so they share one genai.Client and
+with it one pooled set of HTTP connections. The pool is sized for the
+concurrent variation fan-out. When the optional h2 package is installed the
+connections speak HTTP/2, so concurrent calls multiplex over a single TLS
+session instead of opening one connection each.
+"""
+
+import os
+from typing import Optional
+
+import httpx
+from google import genai
+from google.genai import types
+
+# Per-request timeout in milliseconds; image generation can take a while
+REQUEST_TIMEOUT_MS = int(os.getenv("GEMINI_TIMEOUT_MS", "60000"))
+
+_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_client: Optional[genai.Client] = None
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide Gemini client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = genai.Client(
+            api_key=os.getenv("GOOGLE_AI_API_KEY"),
+            http_options=types.HttpOptions(
+                timeout=REQUEST_TIMEOUT_MS,
+                client_args={"limits": _LIMITS, "http2": _HTTP2},
+                async_client_args={"limits": _LIMITS, "http2": _HTTP2},
+            ),
+        )
+    return _client
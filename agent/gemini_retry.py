@@ -0,0 +1,97 @@
+"""
+Retry policy for transient Gemini API failures.
+
+Rate limits (429) and server errors (5xx) are retried with exponential
+backoff and jitter, honouring the server's retry hint when one is given.
+Validation errors and other 4xx responses fail fast so the caller's
+fallback handling still applies.
+"""
+
+import os
+import re
+from typing import Optional
+
+import httpx
+from google.genai import errors
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_API_RETRIES = int(os.getenv("MAX_API_RETRIES", "5"))
+MAX_RETRY_WAIT = 30
+
+_backoff = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)
+_DELAY_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)s?$")
+
+# Total retries performed by this process, surfaced in status.json
+_retry_count = 0
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for errors worth retrying (rate limits, 5xx, network)."""
+    if isinstance(exc, errors.APIError):
+        return exc.code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def _server_retry_delay(exc: Optional[BaseException]) -> Optional[float]:
+    """Extract the server-suggested delay from a Retry-After header or RetryInfo detail."""
+    if not isinstance(exc, errors.APIError):
+        return None
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        value = headers.get("retry-after")
+        if value and _DELAY_PATTERN.match(value.strip()):
+            return float(_DELAY_PATTERN.match(value.strip()).group(1))
+
+    details = exc.details if isinstance(exc.details, dict) else {}
+    for detail in details.get("error", {}).get("details", []) or []:
+        if str(detail.get("@type", "")).endswith("RetryInfo"):
+            match = _DELAY_PATTERN.match(str(detail.get("retryDelay", "")).strip())
+            if match:
+                return float(match.group(1))
+
+    return None
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Use the server's retry hint when present, otherwise exponential jitter."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    delay = _server_retry_delay(exc)
+    if delay is not None:
+        return min(delay, MAX_RETRY_WAIT)
+    return _backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState):
+    """Count and report each retry."""
+    global _retry_count
+    _retry_count += 1
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    name = getattr(retry_state.fn, "__qualname__", "gemini call")
+    print(
+        f"  Transient API error in {name} (attempt {retry_state.attempt_number}/{MAX_API_RETRIES}): "
+        f"{exc}. Retrying in {retry_state.next_action.sleep:.1f}s"
+    )
+
+
+def get_retry_count() -> int:
+    """Number of API retries performed so far by this process."""
+    return _retry_count
+
+
+# Works for both sync and async callables
+retry_transient = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=_wait,
+    stop=stop_after_attempt(MAX_API_RETRIES),
+    before_sleep=_log_retry,
+    reraise=True,
+)
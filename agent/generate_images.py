@@ -4,36 +4,56 @@ Direct image generation script using Google Gemini.
 Uses the new google-genai package for image generation.
 """
 
-import json
+import asyncio
 import os
 import sys
-import base64
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Mapping
 
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
-from PIL import Image
-import io
 
 # Load environment variables
 load_dotenv()
 
-# Configure Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from gemini_client import get_client
+from gemini_retry import retry_transient, get_retry_count
+from json_utils import parse_response
+from job_store import JobStore
+from image_utils import EXTENSIONS, MIME_TYPES, thumb_part
+from sqm_logging import configure_logging, flush_logs, logger
+from verification_schemas import EXTERIOR_VERIFICATION_SCHEMA
+import event_loop
+
+# Shared Gemini client
+client = get_client()
+
+# Retry rate limits and 5xx before falling back
+_generate_content = retry_transient(client.aio.models.generate_content)
 
 # Configuration
 VERIFICATION_THRESHOLD = int(os.getenv("VERIFICATION_THRESHOLD", "80"))
 MAX_REGEN_ATTEMPTS = int(os.getenv("MAX_REGEN_ATTEMPTS", "3"))
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "5"))
+# Attempts launched in parallel per round; 1 keeps the sequential fixing-prompt loop
+CANDIDATES_PER_ROUND = max(1, int(os.getenv("CANDIDATES_PER_ROUND", "1")))
+# Cost-sensitive runs can skip the vision verifier and accept every generation
+VERIFY_DISABLED = os.getenv("VERIFY_DISABLED", "0") == "1"
+# Extra verification tries when the verifier itself errors
+VERIFY_RETRIES = 2
 
 # Models
 IMAGE_MODEL = "gemini-2.0-flash-exp-image-generation"
 VISION_MODEL = "gemini-2.0-flash"
 
 # Variation types to generate
-VARIATIONS = [
+_VARIATION_SPECS = [
     {
         "type": "aerial_view",
         "prompt": "Bird's eye view from above, looking down at the building and its surroundings",
@@ -68,93 +88,62 @@ VARIATIONS = [
     }
 ]
 
+_VARIATION_PROMPT_TEMPLATE = """
+Generate an architectural visualization based on this reference building.
 
-def update_status(job_id: str, output_dir: str, status_data: Dict[str, Any]):
-    """Update the job status file."""
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    status_path = Path(output_dir) / "status.json"
-
-    existing = {}
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            existing = json.load(f)
-
-    existing.update(status_data)
-    existing["updated_at"] = datetime.now().isoformat()
-
-    with open(status_path, "w") as f:
-        json.dump(existing, f, indent=2)
-
-
-def save_image_to_manifest(job_id: str, output_dir: str, image_data: Dict[str, Any]):
-    """Add an image to the job manifest."""
-    manifest_path = Path(output_dir) / "manifest.json"
-
-    manifest = {"images": [], "job_id": job_id, "created_at": datetime.now().isoformat()}
-    if manifest_path.exists():
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
+VARIATION TYPE: {type}
 
-    manifest["images"].append(image_data)
-    manifest["updated_at"] = datetime.now().isoformat()
+INSTRUCTIONS:
+{prompt}
 
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+REQUIREMENTS:
+- The generated image must show the SAME building as the reference
+- Maintain architectural consistency: shape, style, materials, windows, proportions
+- Professional architecture firm quality
+- High quality, photorealistic rendering
+"""
 
-    # Also update status with images
-    status_path = Path(output_dir) / "status.json"
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            status = json.load(f)
-        status["images"] = manifest["images"]
-        with open(status_path, "w") as f:
-            json.dump(status, f, indent=2)
+# Base prompts are constant per variation, so build them once at import
+VARIATIONS = tuple(
+    MappingProxyType({**spec, "full_prompt": _VARIATION_PROMPT_TEMPLATE.format(**spec)})
+    for spec in _VARIATION_SPECS
+)
 
 
 def load_image_as_part(image_path: str) -> types.Part:
     """Load an image file and convert to Gemini Part."""
-    with open(image_path, "rb") as f:
-        image_bytes = f.read()
-
-    # Determine mime type
-    ext = Path(image_path).suffix.lower()
-    mime_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-        ".gif": "image/gif"
-    }
-    mime_type = mime_types.get(ext, "image/jpeg")
+    image_bytes = Path(image_path).read_bytes()
+
+    mime_type = MIME_TYPES.get(Path(image_path).suffix.lower(), "image/jpeg")
 
     return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
 
-def generate_image(hero_image_path: str, variation: Dict, fixing_prompt: Optional[str] = None) -> Optional[bytes]:
-    """Generate a single image variation using Gemini."""
-    try:
-        prompt = f"""
-Generate an architectural visualization based on this reference building.
+def write_image_file(path: Path, data: bytes):
+    """
+    Write image bytes with a single unbuffered os.write.
 
-VARIATION TYPE: {variation['type']}
+    No fsync: generated images can always be regenerated.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write fewer bytes than requested
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
-INSTRUCTIONS:
-{variation['prompt']}
 
-REQUIREMENTS:
-- The generated image must show the SAME building as the reference
-- Maintain architectural consistency: shape, style, materials, windows, proportions
-- Professional architecture firm quality
-- High quality, photorealistic rendering
-"""
+async def generate_image(hero_part: types.Part, variation: Mapping[str, str], fixing_prompt: Optional[str] = None) -> Optional[types.Blob]:
+    """Generate a single image variation using Gemini. Returns the image blob (bytes + mime type)."""
+    try:
+        prompt = variation["full_prompt"]
         if fixing_prompt:
             prompt += f"\n\nFIXING INSTRUCTIONS:\n{fixing_prompt}"
 
-        # Load hero image as Part
-        hero_part = load_image_as_part(hero_image_path)
-
         # Generate with image output
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=IMAGE_MODEL,
             contents=[prompt, hero_part],
             config=types.GenerateContentConfig(
@@ -166,16 +155,23 @@ REQUIREMENTS:
         if response.candidates:
             for part in response.candidates[0].content.parts:
                 if part.inline_data and part.inline_data.mime_type.startswith("image/"):
-                    return part.inline_data.data
+                    # The SDK has already base64-decoded inline_data, so .data is
+                    # the encoded image file as-is and is written without conversion
+                    return part.inline_data
 
         return None
     except Exception as e:
-        print(f"Generation error: {e}")
+        logger.warning(f"Generation error: {e}")
         return None
 
 
-def verify_image(hero_image_path: str, generated_image_path: str, variation_type: str) -> Dict:
-    """Verify architectural consistency between hero and generated image."""
+async def verify_image(hero_thumb: types.Part, generated_bytes: bytes, variation_type: str) -> Dict:
+    """
+    Verify architectural consistency between hero and generated image.
+
+    Both images are compared as downscaled thumbnails; the hero thumbnail is
+    built once per job by the caller.
+    """
     try:
         prompt = f"""
 Compare these two architectural images:
@@ -204,174 +200,256 @@ Respond in JSON format only:
     "suggestions": ["how to fix"]
 }}
 """
-        hero_part = load_image_as_part(hero_image_path)
-        generated_part = load_image_as_part(generated_image_path)
+        generated_thumb = await asyncio.to_thread(thumb_part, generated_bytes)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
-            contents=[prompt, hero_part, generated_part],
+            contents=[prompt, hero_thumb, generated_thumb],
             config=types.GenerateContentConfig(
                 response_mime_type="application/json",
+                response_schema=EXTERIOR_VERIFICATION_SCHEMA,
                 temperature=0.1,
             )
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        return json.loads(result_text.strip())
+        return parse_response(response)
     except Exception as e:
-        print(f"Verification error: {e}")
-        return {"total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
+        logger.warning(f"Verification error: {e}")
+        # Flag verifier failures so they aren't mistaken for a low-quality image
+        return {"verifier_failed": True, "total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
+
+
+_FIX_TEMPLATES = {
+    criterion: f"FIX {criterion}: scored {{}}/20 - improve this aspect"
+    for criterion in ("building_shape", "architectural_style", "materials_facade", "windows_openings", "proportions")
+}
 
 
 def build_fixing_prompt(verification_result: Dict) -> str:
     """Build a fixing prompt from verification results."""
-    lines = []
     breakdown = verification_result.get("breakdown", {})
 
-    for criterion, score in breakdown.items():
-        if score < 16:  # Below 80% for this criterion
-            lines.append(f"FIX {criterion}: scored {score}/20 - improve this aspect")
+    # Below 80% for a criterion
+    fixes = [
+        _FIX_TEMPLATES[criterion].format(score) if criterion in _FIX_TEMPLATES
+        else f"FIX {criterion}: scored {score}/20 - improve this aspect"
+        for criterion, score in breakdown.items()
+        if score < 16
+    ]
+    issues = [f"ISSUE: {issue}" for issue in verification_result.get("issues", [])]
+    suggestions = [f"SUGGESTION: {suggestion}" for suggestion in verification_result.get("suggestions", [])]
+
+    return "\n".join(fixes + issues + suggestions)
+
+
+async def process_variation(
+    index: int,
+    variation: Mapping[str, str],
+    hero_part: types.Part,
+    hero_thumb: types.Part,
+    store: JobStore,
+    sem: asyncio.Semaphore,
+    progress: Dict[str, int],
+) -> bool:
+    """Generate, verify and save a single variation. Returns True if an image was saved."""
+    variation_type = variation["type"]
+    total_variations = len(VARIATIONS)
+    logger.info(f"\n[{index + 1}/{total_variations}] Generating {variation_type}...")
 
-    for issue in verification_result.get("issues", []):
-        lines.append(f"ISSUE: {issue}")
+    store.update_status({
+        "status": "generating",
+        "progress": int((progress["completed"] / total_variations) * 100),
+        "currentImage": progress["completed"] + 1,
+        "totalImages": total_variations,
+        "currentVariation": variation_type,
+        "message": f"Generating {variation_type.replace('_', ' ')}..."
+    })
 
-    for suggestion in verification_result.get("suggestions", []):
-        lines.append(f"SUGGESTION: {suggestion}")
+    # Cumulative timings, recorded in the manifest for threshold tuning
+    timings = {"generation_ms": 0, "verify_ms": 0}
 
-    return "\n".join(lines)
+    async def run_attempt(attempt_number: int, fixing_prompt: Optional[str]):
+        """Generate one candidate and verify it as soon as it is ready."""
+        logger.info(f"  [{variation_type}] Attempt {attempt_number}/{MAX_REGEN_ATTEMPTS}")
 
+        # Generate image
+        async with sem:
+            started = time.perf_counter()
+            image = await generate_image(hero_part, variation, fixing_prompt)
+            timings["generation_ms"] += int((time.perf_counter() - started) * 1000)
 
-def main(hero_image_path: str, output_dir: str, job_id: str):
-    """Main generation workflow."""
-    print(f"Starting generation for job {job_id}")
+        if not image:
+            logger.info(f"  [{variation_type}] Failed to generate image")
+            return None, None
 
-    # Create output directory
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+        if VERIFY_DISABLED:
+            return image, {"total_score": 100, "breakdown": {}, "issues": [], "suggestions": []}
 
-    # Load hero image
-    if not os.path.exists(hero_image_path):
-        print(f"Error: Hero image not found: {hero_image_path}")
-        update_status(job_id, output_dir, {
-            "status": "error",
-            "message": "Hero image not found"
+        # Verify
+        store.update_status({
+            "status": "verifying",
+            "message": f"Verifying {variation_type.replace('_', ' ')}..."
         })
-        return
 
-    hero_image = Image.open(hero_image_path)
-    print(f"Loaded hero image: {hero_image.size}")
+        for verify_try in range(VERIFY_RETRIES + 1):
+            if verify_try:
+                # Retry only the (cheaper) verification, not the generation
+                await asyncio.sleep(2 ** (verify_try - 1))
+            async with sem:
+                started = time.perf_counter()
+                verification = await verify_image(hero_thumb, image.data, variation_type)
+                timings["verify_ms"] += int((time.perf_counter() - started) * 1000)
+            if not verification.get("verifier_failed"):
+                break
+        return image, verification
+
+    attempts = 0
+    best_score = 0
+    best_image = None
+    best_breakdown = None
+    low_confidence = False
+    verified = True
+
+    fixing_prompt = None
+    passed = False
+
+    while attempts < MAX_REGEN_ATTEMPTS and not passed:
+        # Launch a round of candidates together and verify each as it lands.
+        # Later rounds wait for the previous verdict so they can use its fixing prompt.
+        round_size = min(CANDIDATES_PER_ROUND, MAX_REGEN_ATTEMPTS - attempts)
+        tasks = [
+            asyncio.create_task(run_attempt(attempts + n + 1, fixing_prompt))
+            for n in range(round_size)
+        ]
+        attempts += round_size
+
+        round_best = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                image, verification = await next_done
+                if not image:
+                    continue
+
+                if verification.get("verifier_failed"):
+                    # Regenerating can't help while the verifier is down; keep
+                    # the best verified image, or this one as unverified
+                    logger.info(f"  [{variation_type}] Verifier unavailable, accepting image as unverified")
+                    if best_image is None:
+                        best_image = image
+                        verified = False
+                    passed = True
+                    break
+
+                score = verification.get("total_score", 0)
+                logger.info(f"  [{variation_type}] Verification score: {score}/100")
+
+                if score > best_score:
+                    best_score = score
+                    best_image = image
+                    best_breakdown = verification.get("breakdown", {})
+
+                if round_best is None or score >= round_best.get("total_score", 0):
+                    round_best = verification
+
+                if score > VERIFICATION_THRESHOLD:
+                    logger.info(f"  [{variation_type}] PASSED (>{VERIFICATION_THRESHOLD}%)")
+                    passed = True
+                    break
+        finally:
+            # A winner makes the rest of the round redundant
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if not passed and round_best is not None:
+            logger.info(f"  [{variation_type}] FAILED (<={VERIFICATION_THRESHOLD}%), building fixing prompt...")
+            fixing_prompt = build_fixing_prompt(round_best)
+
+    # Save the best image we got
+    if not best_image:
+        logger.info(f"  [{variation_type}] SKIPPED - no image generated")
+        flush_logs()
+        return False
+
+    if not verified or best_score <= VERIFICATION_THRESHOLD:
+        low_confidence = True
+        logger.info(f"  [{variation_type}] Saving as LOW CONFIDENCE (best score: {best_score})")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # Name the file after the format the model actually returned
+    extension = EXTENSIONS.get(best_image.mime_type, ".png")
+    filename = f"{variation_type}_{timestamp}{extension}"
+    final_path = store.output_dir / filename
+
+    write_image_file(final_path, best_image.data)
+
+    # Add to manifest
+    progress["completed"] += 1
+    store.add_image({
+        "id": f"{store.job_id}_{progress['completed']}",
+        "filename": filename,
+        "url": f"/api/images/{store.job_id}/{filename}",
+        "variationType": variation_type,
+        "consistencyScore": best_score,
+        "attempts": attempts,
+        "lowConfidence": low_confidence,
+        "verified": verified,
+        "scoreBreakdown": best_breakdown,
+        "generationMs": timings["generation_ms"],
+        "verifyMs": timings["verify_ms"],
+        "created_at": datetime.now().isoformat()
+    })
+    logger.info(f"  [{variation_type}] Saved: {filename}")
+    flush_logs()
+    return True
 
-    total_variations = len(VARIATIONS)
-    completed = 0
 
-    for i, variation in enumerate(VARIATIONS):
-        variation_type = variation["type"]
-        print(f"\n[{i+1}/{total_variations}] Generating {variation_type}...")
+async def main(hero_image_path: str, output_dir: str, job_id: str):
+    """Main generation workflow."""
+    configure_logging(job_id)
+    logger.info(f"Starting generation for job {job_id}")
+
+    async with JobStore(job_id, output_dir) as store:
+        # Load hero image
+        if not os.path.exists(hero_image_path):
+            logger.error(f"Error: Hero image not found: {hero_image_path}")
+            store.update_status({
+                "status": "error",
+                "message": "Hero image not found"
+            })
+            return
 
-        update_status(job_id, output_dir, {
-            "status": "generating",
-            "progress": int((i / total_variations) * 100),
-            "currentImage": i + 1,
+        # The hero is immutable for the job: read it and build its Part once
+        hero_part = load_image_as_part(hero_image_path)
+        logger.info(f"Loaded hero image: {len(hero_part.inline_data.data)} bytes")
+        # Generation needs full detail; verification only needs a thumbnail
+        hero_thumb = thumb_part(hero_part.inline_data.data)
+
+        total_variations = len(VARIATIONS)
+
+        # Variations are independent, so run them concurrently; the semaphore
+        # bounds in-flight Gemini calls
+        sem = asyncio.Semaphore(GENERATION_CONCURRENCY)
+        progress = {"completed": 0}
+
+        await asyncio.gather(*(
+            process_variation(i, variation, hero_part, hero_thumb, store, sem, progress)
+            for i, variation in enumerate(VARIATIONS)
+        ))
+        completed = progress["completed"]
+
+        # Final status
+        store.update_status({
+            "status": "complete",
+            "progress": 100,
+            "currentImage": total_variations,
             "totalImages": total_variations,
-            "currentVariation": variation_type,
-            "message": f"Generating {variation_type.replace('_', ' ')}..."
+            "message": f"Generated {completed} images",
+            "apiRetries": get_retry_count()
         })
 
-        attempts = 0
-        best_score = 0
-        best_image_data = None
-        best_breakdown = None
-        low_confidence = False
-
-        fixing_prompt = None
-
-        while attempts < MAX_REGEN_ATTEMPTS:
-            attempts += 1
-            print(f"  Attempt {attempts}/{MAX_REGEN_ATTEMPTS}")
-
-            # Generate image
-            image_data = generate_image(hero_image_path, variation, fixing_prompt)
-
-            if not image_data:
-                print(f"  Failed to generate image")
-                continue
-
-            # Save temporarily for verification
-            temp_path = Path(output_dir) / f"temp_{variation_type}.png"
-            with open(temp_path, "wb") as f:
-                f.write(image_data)
-
-            # Verify
-            update_status(job_id, output_dir, {
-                "status": "verifying",
-                "message": f"Verifying {variation_type.replace('_', ' ')}..."
-            })
-
-            verification = verify_image(hero_image_path, str(temp_path), variation_type)
-            score = verification.get("total_score", 0)
-            print(f"  Verification score: {score}/100")
-
-            if score > best_score:
-                best_score = score
-                best_image_data = image_data
-                best_breakdown = verification.get("breakdown", {})
-
-            if score > VERIFICATION_THRESHOLD:
-                print(f"  PASSED (>{VERIFICATION_THRESHOLD}%)")
-                # Clean up temp file
-                temp_path.unlink(missing_ok=True)
-                break
-            else:
-                print(f"  FAILED (<={VERIFICATION_THRESHOLD}%), building fixing prompt...")
-                fixing_prompt = build_fixing_prompt(verification)
-                # Clean up temp file
-                temp_path.unlink(missing_ok=True)
-
-        # Save the best image we got
-        if best_image_data:
-            if best_score <= VERIFICATION_THRESHOLD:
-                low_confidence = True
-                print(f"  Saving as LOW CONFIDENCE (best score: {best_score})")
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{variation_type}_{timestamp}.png"
-            final_path = Path(output_dir) / filename
-
-            with open(final_path, "wb") as f:
-                f.write(best_image_data)
-
-            # Add to manifest
-            image_entry = {
-                "id": f"{job_id}_{completed + 1}",
-                "filename": filename,
-                "url": f"/api/images/{job_id}/{filename}",
-                "variationType": variation_type,
-                "consistencyScore": best_score,
-                "attempts": attempts,
-                "lowConfidence": low_confidence,
-                "scoreBreakdown": best_breakdown,
-                "created_at": datetime.now().isoformat()
-            }
-            save_image_to_manifest(job_id, output_dir, image_entry)
-            completed += 1
-            print(f"  Saved: {filename}")
-        else:
-            print(f"  SKIPPED - no image generated")
-
-    # Final status
-    update_status(job_id, output_dir, {
-        "status": "complete",
-        "progress": 100,
-        "currentImage": total_variations,
-        "totalImages": total_variations,
-        "message": f"Generated {completed} images"
-    })
-
-    print(f"\nComplete! Generated {completed}/{total_variations} images")
+    logger.info(f"\nComplete! Generated {completed}/{total_variations} images")
+    flush_logs()
 
 
 if __name__ == "__main__":
@@ -379,4 +457,4 @@ if __name__ == "__main__":
         print("Usage: python generate_images.py <hero_image_path> <output_dir> <job_id>")
         sys.exit(1)
 
-    main(sys.argv[1], sys.argv[2], sys.argv[3])
+    event_loop.run(main(sys.argv[1], sys.argv[2], sys.argv[3]))
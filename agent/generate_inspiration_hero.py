@@ -17,15 +17,15 @@ Options:
 """
 
 import argparse
-import json
+import asyncio
 import os
+import shutil
 import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
 # Load environment variables
@@ -41,9 +41,19 @@ from prompts import (
     build_style_transfer_hero_prompt,
     build_regeneration_prompt_with_feedback,
 )
+from gemini_client import get_client
+from prompt_cache import get_cached_parse, cache_parse
+from gemini_retry import retry_transient, get_retry_count
+from json_utils import parse_json_response
+from job_store import JobStore
+from image_utils import MIME_TYPES
+import event_loop
 
-# Configure Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+# Shared Gemini client
+client = get_client()
+
+# Retry rate limits and 5xx before falling back
+_generate_content = retry_transient(client.aio.models.generate_content)
 
 # Models
 IMAGE_MODEL = "gemini-3-pro-image-preview"
@@ -51,41 +61,30 @@ VISION_MODEL = "gemini-2.0-flash"
 TEXT_MODEL = "gemini-2.0-flash"
 
 
-def update_status(job_id: str, output_dir: str, status_data: Dict[str, Any]):
-    """Update the job status file."""
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    status_path = Path(output_dir) / "status.json"
-
-    existing = {}
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            existing = json.load(f)
+def load_image_as_part(image_path: str) -> types.Part:
+    """Load an image file and convert to Gemini Part."""
+    image_bytes = Path(image_path).read_bytes()
 
-    existing.update(status_data)
-    existing["updated_at"] = datetime.now().isoformat()
+    mime_type = MIME_TYPES.get(Path(image_path).suffix.lower(), "image/png")
 
-    with open(status_path, "w") as f:
-        json.dump(existing, f, indent=2)
+    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
 
-def load_image_as_part(image_path: str) -> types.Part:
-    """Load an image file and convert to Gemini Part."""
-    with open(image_path, "rb") as f:
-        image_bytes = f.read()
-
-    ext = Path(image_path).suffix.lower()
-    mime_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-    }
-    mime_type = mime_types.get(ext, "image/png")
+def link_or_copy(source_path: str, dest_path: Path):
+    """
+    Place a read-only reference copy of a file in the job directory.
 
-    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+    Hard-links when source and destination share a filesystem (constant time,
+    no bytes copied); otherwise falls back to shutil.copy2, which uses
+    sendfile on Linux.
+    """
+    try:
+        os.link(source_path, dest_path)
+    except OSError:
+        shutil.copy2(source_path, dest_path)
 
 
-def parse_user_prompt(prompt: str) -> Dict[str, Any]:
+async def parse_user_prompt(prompt: str) -> Dict[str, Any]:
     """Parse the user's text prompt to extract project details."""
     if not prompt:
         return {
@@ -100,6 +99,10 @@ def parse_user_prompt(prompt: str) -> Dict[str, Any]:
             "summary": ""
         }
 
+    cached = get_cached_parse(prompt)
+    if cached is not None:
+        return cached
+
     parse_prompt = """<task>
 Analyze the architectural project description and extract structured details.
 </task>
@@ -132,7 +135,7 @@ Return a single JSON object with these fields:
 </rules>""".format(prompt=prompt)
 
     try:
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=TEXT_MODEL,
             contents=parse_prompt,
             config=types.GenerateContentConfig(
@@ -141,15 +144,10 @@ Return a single JSON object with these fields:
             )
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        parsed = json.loads(result_text.strip())
+        parsed = parse_json_response(response.text)
         if isinstance(parsed, list) and len(parsed) > 0:
             parsed = parsed[0]
+        cache_parse(prompt, parsed)
         return parsed
     except Exception as e:
         print(f"Prompt parsing error: {e}")
@@ -166,7 +164,7 @@ Return a single JSON object with these fields:
         }
 
 
-def analyze_inspiration_style(inspiration_path: str) -> Dict[str, Any]:
+async def analyze_inspiration_style(inspiration_path: str) -> Dict[str, Any]:
     """
     Analyze the inspiration image to extract style elements.
 
@@ -179,7 +177,7 @@ def analyze_inspiration_style(inspiration_path: str) -> Dict[str, Any]:
         analysis_prompt = build_style_analysis_prompt()
         image_part = load_image_as_part(inspiration_path)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
             contents=[image_part, analysis_prompt],  # Image FIRST
             config=types.GenerateContentConfig(
@@ -188,13 +186,7 @@ def analyze_inspiration_style(inspiration_path: str) -> Dict[str, Any]:
             )
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        style_analysis = json.loads(result_text.strip())
+        style_analysis = parse_json_response(response.text)
         print(f"  Style identified: {style_analysis.get('architectural_style', {}).get('primary', 'Unknown')}")
         return style_analysis
 
@@ -236,7 +228,7 @@ def analyze_inspiration_style(inspiration_path: str) -> Dict[str, Any]:
         }
 
 
-def generate_hero_image(
+async def generate_hero_image(
     prompt: str,
     inspiration_path: str,
     aspect_ratio: str = "16:9"
@@ -262,7 +254,7 @@ def generate_hero_image(
 
         contents.append(prompt)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=IMAGE_MODEL,
             contents=contents,
             config=types.GenerateContentConfig(
@@ -287,7 +279,7 @@ def generate_hero_image(
         return None
 
 
-def main(
+async def main(
     inspiration_path: str,
     output_dir: str,
     job_id: str,
@@ -312,162 +304,152 @@ def main(
     print(f"Inspiration image: {inspiration_path}")
     print(f"Using model: {IMAGE_MODEL}")
 
-    # Create output directory
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-    # Determine if this is a regeneration
-    is_regeneration = feedback is not None
-    status_type = "regenerating_hero" if is_regeneration else "generating_inspiration_hero"
-
-    # Initial status
-    update_status(job_id, output_dir, {
-        "status": status_type,
-        "progress": 5,
-        "currentImage": 0,
-        "totalImages": 18,
-        "flowType": "inspiration",
-        "message": "Analyzing inspiration style..." if not is_regeneration else "Regenerating hero with feedback..."
-    })
-
-    # Step 1: Analyze inspiration style
-    print("\n[1/3] Analyzing inspiration style...")
-    style_analysis = analyze_inspiration_style(inspiration_path)
-
-    update_status(job_id, output_dir, {
-        "progress": 20,
-        "message": "Parsing project requirements..."
-    })
-
-    # Step 2: Parse user prompt (if provided)
-    print("\n[2/3] Processing project requirements...")
-    parsed = parse_user_prompt(user_prompt or "")
-
-    # Override with explicit values if provided
-    if project_type:
-        parsed["project_type"] = project_type
-    if suburb:
-        parsed["suburb"] = suburb
-
-    # Get suburb context
-    suburb_name = parsed.get("suburb") or suburb or "balwyn"
-    suburb_context = build_suburb_context_prompt(suburb_name)
-
-    # Get photorealistic requirements
-    photorealistic = build_photorealistic_prompt(
-        parsed.get("project_type", "dual_occupancy"),
-        "daylight_soft"
-    )
+    # Status and manifest are written in the background and flushed on exit
+    async with JobStore(job_id, output_dir) as store:
+        # Determine if this is a regeneration
+        is_regeneration = feedback is not None
+        status_type = "regenerating_hero" if is_regeneration else "generating_inspiration_hero"
+
+        # Initial status
+        store.update_status({
+            "status": status_type,
+            "progress": 5,
+            "currentImage": 0,
+            "totalImages": 18,
+            "flowType": "inspiration",
+            "message": "Analyzing inspiration style..." if not is_regeneration else "Regenerating hero with feedback..."
+        })
 
-    update_status(job_id, output_dir, {
-        "progress": 30,
-        "message": "Generating hero image..."
-    })
-
-    # Step 3: Generate hero image
-    print("\n[3/3] Generating hero image from inspiration...")
-
-    # Build the generation prompt
-    generation_prompt = build_style_transfer_hero_prompt(
-        style_analysis=style_analysis,
-        user_prompt=user_prompt or "",
-        parsed=parsed,
-        suburb_context=suburb_context,
-        photorealistic_requirements=photorealistic
-    )
+        # Steps 1 and 2 are independent model calls, so run them together:
+        # analyze inspiration style and parse the user prompt (if provided)
+        print("\n[1/3] Analyzing inspiration style...")
+        print("\n[2/3] Processing project requirements...")
+        style_task = asyncio.create_task(analyze_inspiration_style(inspiration_path))
+        parse_task = asyncio.create_task(parse_user_prompt(user_prompt or ""))
+        style_analysis, parsed = await asyncio.gather(style_task, parse_task)
+
+        # Override with explicit values if provided
+        if project_type:
+            parsed["project_type"] = project_type
+        if suburb:
+            parsed["suburb"] = suburb
+
+        # Get suburb context
+        suburb_name = parsed.get("suburb") or suburb or "balwyn"
+        suburb_context = build_suburb_context_prompt(suburb_name)
+
+        # Get photorealistic requirements
+        photorealistic = build_photorealistic_prompt(
+            parsed.get("project_type", "dual_occupancy"),
+            "daylight_soft"
+        )
+
+        store.update_status({
+            "progress": 30,
+            "message": "Generating hero image..."
+        })
+
+        # Step 3: Generate hero image
+        print("\n[3/3] Generating hero image from inspiration...")
+
+        # Build the generation prompt
+        generation_prompt = build_style_transfer_hero_prompt(
+            style_analysis=style_analysis,
+            user_prompt=user_prompt or "",
+            parsed=parsed,
+            suburb_context=suburb_context,
+            photorealistic_requirements=photorealistic
+        )
+
+        # Add feedback if regenerating
+        if feedback:
+            generation_prompt = build_regeneration_prompt_with_feedback(
+                generation_prompt,
+                feedback
+            )
+            print(f"  Applying user feedback: {feedback[:100]}...")
 
-    # Add feedback if regenerating
-    if feedback:
-        generation_prompt = build_regeneration_prompt_with_feedback(
+        # Generate the hero
+        hero_image_data = await generate_hero_image(
             generation_prompt,
-            feedback
+            inspiration_path,
+            aspect_ratio="16:9"
         )
-        print(f"  Applying user feedback: {feedback[:100]}...")
 
-    # Generate the hero
-    hero_image_data = generate_hero_image(
-        generation_prompt,
-        inspiration_path,
-        aspect_ratio="16:9"
-    )
+        if not hero_image_data:
+            print("  ERROR: Failed to generate hero image")
+            store.update_status({
+                "status": "error",
+                "message": "Failed to generate hero image from inspiration",
+                "apiRetries": get_retry_count()
+            })
+            return
+
+        # Save hero image
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        hero_filename = f"hero_facade_{timestamp}.png"
+        hero_path = store.output_dir / hero_filename
+
+        hero_path.write_bytes(hero_image_data)
+
+        print(f"  Saved hero image: {hero_filename}")
+
+        # Copy inspiration image to output dir for reference
+        inspiration_ext = Path(inspiration_path).suffix
+        inspiration_filename = f"inspiration_{timestamp}{inspiration_ext}"
+        inspiration_output_path = store.output_dir / inspiration_filename
+
+        link_or_copy(inspiration_path, inspiration_output_path)
+        print(f"  Copied inspiration: {inspiration_filename}")
+
+        # Create/update manifest
+        store.set_manifest({
+            "job_id": job_id,
+            "type": "inspiration_showcase",
+            "flowType": "inspiration",
+            "prompt": user_prompt or "",
+            "parsed": parsed,
+            "suburb": suburb_name,
+            "model": IMAGE_MODEL,
+            "created_at": datetime.now().isoformat(),
+            "inspiration": {
+                "imagePath": f"/api/images/{job_id}/{inspiration_filename}",
+                "filename": inspiration_filename,
+                "styleAnalysis": style_analysis
+            },
+            "hero": {
+                "imagePath": f"/api/images/{job_id}/{hero_filename}",
+                "filename": hero_filename,
+                "generatedAt": datetime.now().isoformat(),
+                "attempts": 1
+            },
+            "images": []
+        })
 
-    if not hero_image_data:
-        print("  ERROR: Failed to generate hero image")
-        update_status(job_id, output_dir, {
-            "status": "error",
-            "message": "Failed to generate hero image from inspiration"
+        # Update status to awaiting approval
+        store.update_status({
+            "status": "awaiting_approval",
+            "progress": 10,
+            "currentImage": 1,
+            "totalImages": 18,
+            "flowType": "inspiration",
+            "message": "Hero generated from inspiration - please review and approve",
+            "inspiration": {
+                "imagePath": f"/api/images/{job_id}/{inspiration_filename}",
+                "styleAnalysis": style_analysis
+            },
+            "hero": {
+                "imagePath": f"/api/images/{job_id}/{hero_filename}",
+                "filename": hero_filename,
+                "generatedAt": datetime.now().isoformat()
+            },
+            "parsed": parsed,
+            "apiRetries": get_retry_count()
         })
-        return
-
-    # Save hero image
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    hero_filename = f"hero_facade_{timestamp}.png"
-    hero_path = Path(output_dir) / hero_filename
-
-    with open(hero_path, "wb") as f:
-        f.write(hero_image_data)
-
-    print(f"  Saved hero image: {hero_filename}")
-
-    # Copy inspiration image to output dir for reference
-    inspiration_ext = Path(inspiration_path).suffix
-    inspiration_filename = f"inspiration_{timestamp}{inspiration_ext}"
-    inspiration_output_path = Path(output_dir) / inspiration_filename
-
-    import shutil
-    shutil.copy2(inspiration_path, inspiration_output_path)
-    print(f"  Copied inspiration: {inspiration_filename}")
-
-    # Create/update manifest
-    manifest_path = Path(output_dir) / "manifest.json"
-    manifest = {
-        "job_id": job_id,
-        "type": "inspiration_showcase",
-        "flowType": "inspiration",
-        "prompt": user_prompt or "",
-        "parsed": parsed,
-        "suburb": suburb_name,
-        "model": IMAGE_MODEL,
-        "created_at": datetime.now().isoformat(),
-        "inspiration": {
-            "imagePath": f"/api/images/{job_id}/{inspiration_filename}",
-            "filename": inspiration_filename,
-            "styleAnalysis": style_analysis
-        },
-        "hero": {
-            "imagePath": f"/api/images/{job_id}/{hero_filename}",
-            "filename": hero_filename,
-            "generatedAt": datetime.now().isoformat(),
-            "attempts": 1
-        },
-        "images": []
-    }
-
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-
-    # Update status to awaiting approval
-    update_status(job_id, output_dir, {
-        "status": "awaiting_approval",
-        "progress": 10,
-        "currentImage": 1,
-        "totalImages": 18,
-        "flowType": "inspiration",
-        "message": "Hero generated from inspiration - please review and approve",
-        "inspiration": {
-            "imagePath": f"/api/images/{job_id}/{inspiration_filename}",
-            "styleAnalysis": style_analysis
-        },
-        "hero": {
-            "imagePath": f"/api/images/{job_id}/{hero_filename}",
-            "filename": hero_filename,
-            "generatedAt": datetime.now().isoformat()
-        },
-        "parsed": parsed
-    })
-
-    print(f"\nHero generation complete!")
-    print(f"Status: awaiting_approval")
-    print(f"Hero image: {hero_path}")
+
+        print(f"\nHero generation complete!")
+        print(f"Status: awaiting_approval")
+        print(f"Hero image: {hero_path}")
 
 
 if __name__ == "__main__":
@@ -497,7 +479,7 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    main(
+    event_loop.run(main(
         inspiration_path=args.inspiration_path,
         output_dir=args.output_dir,
         job_id=args.job_id,
@@ -505,4 +487,4 @@ if __name__ == "__main__":
         project_type=args.project_type,
         suburb=args.suburb,
         feedback=args.feedback
-    )
+    ))
@@ -14,16 +14,24 @@ Updated to follow Google AI best practices:
 """
 
 import argparse
-import json
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
 import os
+import re
+import shutil
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Union
 
+import aiofiles
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
+from PIL import Image, ImageStat
 
 # Load environment variables
 load_dotenv()
@@ -34,23 +42,95 @@ sys.path.insert(0, str(Path(__file__).parent))
 from prompts import (
     build_suburb_context_prompt,
     get_all_shots_ordered,
+    get_hero_shot,
+    get_shot_by_id,
     get_shots_for_project_type,
+    is_multi_unit_project,
     build_photorealistic_prompt,
-    get_lighting_for_shot,
+    get_prompt_for_shot,
+    ShotType,
 )
+from gemini_client import get_client
+from gemini_retry import retry_transient, get_retry_count
+from json_utils import parse_json_response, parse_response
+from job_store import JobStore
+from image_utils import EXTENSIONS, MIME_TYPES, thumb_part
+import event_loop
+from prompt_cache import get_cached_parse, cache_parse
+from verification_schemas import (
+    EXTERIOR_VERIFICATION_SCHEMA,
+    INTERIOR_VERIFICATION_SCHEMA,
+    BATCH_VERIFICATION_SCHEMA,
+)
+
+# Shared Gemini client
+client = get_client()
 
-# Configure Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+# Retry rate limits and 5xx before falling back
+_generate_content = retry_transient(client.aio.models.generate_content)
 
 # Configuration
 VERIFICATION_THRESHOLD = int(os.getenv("VERIFICATION_THRESHOLD", "80"))
 MAX_REGEN_ATTEMPTS = int(os.getenv("MAX_REGEN_ATTEMPTS", "3"))
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "5"))
+# Shots per job that may be regenerated after the first round
+MAX_REGEN_BUDGET = int(os.getenv("MAX_REGEN_BUDGET", "5"))
+# A regeneration that gains fewer points than this ends the shot's retries
+MIN_SCORE_GAIN = int(os.getenv("MIN_SCORE_GAIN", "5"))
+# Batch Mode polling for --use-batch
+BATCH_POLL_INTERVAL = 10
+BATCH_TIMEOUT = int(os.getenv("BATCH_TIMEOUT", "1800"))
+_BATCH_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"
+})
+# Print prompts before whitespace compaction
+DEBUG_PROMPTS = os.getenv("DEBUG_PROMPTS", "0") == "1"
+# Local pre-check: candidates within this many dHash bits of the hero are
+# echoes of the reference, and near-uniform candidates are blank renders
+ECHO_HASH_DISTANCE = 4
+MIN_IMAGE_STDDEV = 4.0
 
 # Models - Updated to Gemini 3 Pro Image Preview
 IMAGE_MODEL = "gemini-3-pro-image-preview"
 VISION_MODEL = "gemini-2.0-flash"
 TEXT_MODEL = "gemini-2.0-flash"
 
+# Request configs are immutable, so build them once; temperature 1.0 is the
+# Gemini 3 recommendation
+_TEXT_CONFIG = types.GenerateContentConfig(temperature=1.0)
+_JSON_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    temperature=1.0,
+)
+_BATCH_VERIFY_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=BATCH_VERIFICATION_SCHEMA,
+    temperature=1.0,
+)
+
+
+def _build_image_config(aspect_ratio: str) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        response_modalities=["IMAGE", "TEXT"],
+        temperature=1.0,
+        image_config=types.ImageConfig(
+            aspect_ratio=aspect_ratio,
+            image_size="2K"  # High quality output
+        )
+    )
+
+
+_IMAGE_CONFIG_BY_RATIO = {
+    ratio: _build_image_config(ratio) for ratio in ("16:9", "1:1", "3:4", "4:3")
+}
+
+
+def _image_config(aspect_ratio: str) -> types.GenerateContentConfig:
+    """Image generation config for an aspect ratio, prebuilt for every ratio the shot list uses."""
+    config = _IMAGE_CONFIG_BY_RATIO.get(aspect_ratio)
+    return config if config is not None else _build_image_config(aspect_ratio)
+
+
 # System instruction for consistent architectural generation
 ARCHITECT_SYSTEM_INSTRUCTION = """You are a professional architectural visualization specialist for SQM Architects, Melbourne.
 
@@ -69,58 +149,31 @@ Key principles:
 """
 
 
-def update_status(job_id: str, output_dir: str, status_data: Dict[str, Any]):
-    """Update the job status file."""
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    status_path = Path(output_dir) / "status.json"
-
-    existing = {}
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            existing = json.load(f)
+_SPACE_RUNS = re.compile(r"[ \t]{2,}")
+_LINE_PADDING = re.compile(r"[ \t]*\n[ \t]*")
 
-    existing.update(status_data)
-    existing["updated_at"] = datetime.now().isoformat()
 
-    with open(status_path, "w") as f:
-        json.dump(existing, f, indent=2)
-
-
-def save_image_to_manifest(job_id: str, output_dir: str, image_data: Dict[str, Any]):
-    """Add an image to the job manifest."""
-    manifest_path = Path(output_dir) / "manifest.json"
-
-    manifest = {
-        "images": [],
-        "job_id": job_id,
-        "created_at": datetime.now().isoformat(),
-        "type": "project_showcase"
-    }
-    if manifest_path.exists():
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
-
-    manifest["images"].append(image_data)
-    manifest["updated_at"] = datetime.now().isoformat()
-
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+def _compact_prompt(prompt: str) -> str:
+    """
+    Collapse indentation and runs of spaces in a prompt to save input tokens.
 
-    # Also update status with images
-    status_path = Path(output_dir) / "status.json"
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            status = json.load(f)
-        status["images"] = manifest["images"]
-        with open(status_path, "w") as f:
-            json.dump(status, f, indent=2)
+    Line breaks, and therefore the XML tag layout, are kept. DEBUG_PROMPTS=1
+    prints the original prompt first.
+    """
+    if DEBUG_PROMPTS:
+        print(f"--- prompt ---\n{prompt}\n--------------")
+    return _LINE_PADDING.sub("\n", _SPACE_RUNS.sub(" ", prompt)).strip()
 
 
-def parse_user_prompt(prompt: str) -> Dict[str, Any]:
+async def parse_user_prompt(prompt: str) -> Dict[str, Any]:
     """
     Parse the user's text prompt to extract project details using Gemini.
     Uses XML-structured prompt for better parsing accuracy.
     """
+    cached = get_cached_parse(prompt)
+    if cached is not None:
+        return cached
+
     parse_prompt = """<task>
 Analyze the architectural project description and extract structured details.
 </task>
@@ -153,26 +206,17 @@ Return a single JSON object with these fields:
 </rules>""".format(prompt=prompt)
 
     try:
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=TEXT_MODEL,
-            contents=parse_prompt,
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=1.0,  # Gemini 3 recommendation
-            )
+            contents=_compact_prompt(parse_prompt),
+            config=_JSON_CONFIG
         )
 
-        result_text = response.text.strip()
-        # Clean markdown code blocks if present
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        parsed = json.loads(result_text.strip())
+        parsed = parse_json_response(response.text)
         # Handle case where LLM returns an array instead of object
         if isinstance(parsed, list) and len(parsed) > 0:
             parsed = parsed[0]
+        cache_parse(prompt, parsed)
         return parsed
     except Exception as e:
         print(f"Prompt parsing error: {e}")
@@ -256,19 +300,19 @@ This is the PRIMARY HERO IMAGE that establishes the building design for all subs
 <output>
 Generate a single photorealistic exterior photograph of this building.
 </output>"""
-    return prompt
+    return _compact_prompt(prompt)
 
 
-def build_variation_prompt(
-    shot: Dict[str, Any],
-    parsed: Dict[str, Any],
+@functools.lru_cache(maxsize=8)
+def _variation_preamble(
+    project_type: str,
+    style: str,
+    materials: str,
     suburb_context: str,
     hero_description: str
 ) -> str:
-    """Build XML-structured prompt for generating variations based on the hero image."""
-    lighting = get_lighting_for_shot(shot["id"])
-
-    prompt = f"""<role>
+    """Job-constant head of every variation prompt, rendered once per job."""
+    return f"""<role>
 You are a professional architectural photographer creating a variation shot of an existing building.
 The reference image shows the EXACT building you must photograph from a different angle/time/focus.
 </role>
@@ -278,21 +322,40 @@ The reference image shows the EXACT building you must photograph from a differen
 </reference_building>
 
 <project>
-<type>{parsed.get('project_type', 'dual_occupancy').replace('_', ' ').title()}</type>
-<style>{', '.join(parsed.get('style_keywords', ['modern']))}</style>
-<materials>{', '.join(parsed.get('materials', ['brick', 'render']))}</materials>
+<type>{project_type.replace('_', ' ').title()}</type>
+<style>{style}</style>
+<materials>{materials}</materials>
 </project>
 
 <location>
 {suburb_context}
 </location>
+"""
+
 
+def build_variation_prompt(
+    shot: ShotType,
+    parsed: Dict[str, Any],
+    suburb_context: str,
+    hero_description: str
+) -> str:
+    """Build XML-structured prompt for generating variations based on the hero image."""
+    project_type = parsed.get('project_type', 'dual_occupancy')
+    preamble = _variation_preamble(
+        project_type,
+        ', '.join(parsed.get('style_keywords', ['modern'])),
+        ', '.join(parsed.get('materials', ['brick', 'render'])),
+        suburb_context,
+        hero_description
+    )
+
+    prompt = f"""{preamble}
 <photorealistic_requirements>
-{build_photorealistic_prompt(parsed.get('project_type', 'dual_occupancy'), lighting)}
+{get_prompt_for_shot(shot.id, project_type)}
 </photorealistic_requirements>
 
 <shot_specification>
-{shot['prompt']}
+{shot.prompt}
 </shot_specification>
 
 <consistency_requirements>
@@ -308,64 +371,64 @@ CRITICAL - You must show the EXACT SAME BUILDING as the reference image:
 <output>
 Generate a single photorealistic photograph showing this exact building from the specified angle/perspective.
 </output>"""
-    return prompt
+    return _compact_prompt(prompt)
 
 
-def load_image_as_part(image_path: str) -> types.Part:
-    """Load an image file and convert to Gemini Part."""
-    with open(image_path, "rb") as f:
-        image_bytes = f.read()
+@functools.lru_cache(maxsize=32)
+def _load_part_cached(image_path: Path, mtime_ns: int, size: int) -> types.Part:
+    image_bytes = image_path.read_bytes()
 
-    ext = Path(image_path).suffix.lower()
-    mime_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-    }
-    mime_type = mime_types.get(ext, "image/png")
+    mime_type = MIME_TYPES.get(image_path.suffix.lower(), "image/png")
 
     return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
 
-def get_aspect_ratio_for_shot(shot_id: str) -> str:
-    """Get the appropriate aspect ratio for each shot type."""
-    # Landscape shots (16:9)
-    landscape_shots = [
-        "hero_facade", "hero_twilight", "hero_elevated",
-        "context_street", "interior_living", "interior_kitchen",
-        "interior_master", "lifestyle_morning", "lifestyle_evening",
-        # Multi-unit extra shots
-        "multi_unit_variety", "multi_shared_spaces"
-    ]
-    # Square shots (1:1)
-    square_shots = ["feature_material"]
-    # Portrait shots (3:4)
-    portrait_shots = ["spatial_staircase", "spatial_volume"]
-    # Standard shots (4:3)
-    standard_shots = [
-        "context_aerial", "context_approach", "feature_entry",
-        "feature_signature", "interior_bathroom", "spatial_window"
-    ]
+def load_image_as_part(image_path: Path) -> types.Part:
+    """
+    Load an image file as a Gemini Part, reusing the Part while the file is unchanged.
+
+    The hero is the reference for every shot, so this avoids re-reading it from
+    disk for each generation and verification.
+    """
+    stat = image_path.stat()
+    return _load_part_cached(image_path, stat.st_mtime_ns, stat.st_size)
 
-    if shot_id in landscape_shots:
-        return "16:9"
-    elif shot_id in square_shots:
-        return "1:1"
-    elif shot_id in portrait_shots:
-        return "3:4"
-    else:
-        return "4:3"
 
+# A reference image given either as a local file or as an already-built Part
+# (e.g. a File API upload)
+ImageRef = Union[Path, types.Part]
 
-def generate_image(
+
+def _as_part(image: ImageRef) -> types.Part:
+    return image if isinstance(image, types.Part) else load_image_as_part(image)
+
+
+async def upload_reference(image_path: Path) -> Optional[types.Part]:
+    """
+    Upload a reference image once through the File API and return a Part pointing at it.
+
+    Requests that reuse the Part send a short file URI instead of the image
+    bytes. Uploads last 48 hours, far longer than a job. Returns None if the
+    upload fails, in which case callers send the image inline.
+    """
+    try:
+        uploaded = await client.aio.files.upload(file=image_path)
+        return types.Part.from_uri(file_uri=uploaded.uri, mime_type=uploaded.mime_type)
+    except Exception as e:
+        print(f"Reference upload error, sending image inline: {e}")
+        return None
+
+
+async def generate_image(
     prompt: str,
-    reference_image_path: Optional[str] = None,
+    reference_image: Optional[ImageRef] = None,
     aspect_ratio: str = "16:9"
-) -> Optional[bytes]:
+) -> Optional[types.Blob]:
     """
     Generate an image using Gemini 3 Pro Image Preview.
 
+    The image comes back as a Blob so its MIME type travels with the bytes.
+
     Best practices applied:
     - Reference image placed BEFORE text prompt in contents
     - Aspect ratio configured via image_config
@@ -376,43 +439,125 @@ def generate_image(
         # Per docs: "place the text prompt after the image part"
         contents = []
 
-        if reference_image_path and os.path.exists(reference_image_path):
-            reference_part = load_image_as_part(reference_image_path)
-            contents.append(reference_part)
+        if reference_image is not None:
+            try:
+                contents.append(_as_part(reference_image))
+            except OSError as e:
+                print(f"Reference image unavailable, generating without it: {e}")
 
         contents.append(prompt)
 
-        # Configure with aspect ratio and resolution
-        response = client.models.generate_content(
+        # Aspect ratio and resolution come from the prebuilt config
+        response = await _generate_content(
             model=IMAGE_MODEL,
             contents=contents,
-            config=types.GenerateContentConfig(
-                response_modalities=["IMAGE", "TEXT"],
-                temperature=1.0,  # Gemini 3 recommendation
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                    image_size="2K"  # High quality output
-                )
-            )
+            config=_image_config(aspect_ratio)
         )
 
-        # Extract image from response
-        if response.candidates:
-            for part in response.candidates[0].content.parts:
-                if part.inline_data and part.inline_data.mime_type.startswith("image/"):
-                    return part.inline_data.data
-
-        return None
+        return _extract_image(response)
     except Exception as e:
         print(f"Generation error: {e}")
         return None
 
 
-def describe_hero_image(image_path: str) -> str:
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# IEND chunk type plus its fixed CRC; every complete PNG ends with these 8 bytes
+PNG_TRAILER = b"IEND\xaeB`\x82"
+
+
+def is_complete_png(data: bytes) -> bool:
+    """Cheap structural check that a PNG payload wasn't truncated or replaced by an error body."""
+    return data.startswith(PNG_SIGNATURE) and data.endswith(PNG_TRAILER)
+
+
+def _extract_image(response: Optional[types.GenerateContentResponse]) -> Optional[types.Blob]:
+    """Return the first image in a generation response, if any."""
+    if response and response.candidates and response.candidates[0].content:
+        for part in response.candidates[0].content.parts or []:
+            if part.inline_data and part.inline_data.mime_type.startswith("image/"):
+                data = part.inline_data.data
+                if part.inline_data.mime_type == "image/png" and not is_complete_png(data):
+                    # Treated as a failed generation so the shot is retried
+                    print(f"Discarding incomplete PNG ({len(data)} bytes)")
+                    return None
+                return part.inline_data
+    return None
+
+
+async def generate_images_batch(
+    requests: List[Tuple[str, str]],
+    reference_image: ImageRef
+) -> Optional[List[Optional[types.Blob]]]:
+    """
+    Generate several images in one Gemini Batch Mode job.
+
+    requests is a list of (prompt, aspect_ratio). The reference image is
+    referenced through the File API (uploaded here if it is still a local
+    path), which keeps the inline batch payload small. Returns one result per request
+    (None where that request produced no image), or None if the batch job
+    itself fails or times out so the caller can fall back to single calls.
+    """
+    try:
+        if isinstance(reference_image, types.Part):
+            reference_part = reference_image
+        else:
+            reference_part = await upload_reference(reference_image)
+            if reference_part is None:
+                return None
+
+        job = await client.aio.batches.create(
+            model=IMAGE_MODEL,
+            src=[
+                types.InlinedRequest(
+                    contents=[reference_part, prompt],  # Image before prompt
+                    config=_image_config(aspect_ratio)
+                )
+                for prompt, aspect_ratio in requests
+            ],
+            config=types.CreateBatchJobConfig(display_name="sqm-variations")
+        )
+        print(f"  Submitted batch job {job.name} with {len(requests)} requests")
+
+        deadline = time.monotonic() + BATCH_TIMEOUT
+        while job.state.name not in _BATCH_DONE_STATES:
+            if time.monotonic() > deadline:
+                print(f"  Batch job {job.name} timed out, cancelling")
+                await client.aio.batches.cancel(name=job.name)
+                return None
+            await asyncio.sleep(BATCH_POLL_INTERVAL)
+            job = await client.aio.batches.get(name=job.name)
+
+        if job.state.name != "JOB_STATE_SUCCEEDED":
+            print(f"  Batch job {job.name} ended as {job.state.name}: {job.error}")
+            return None
+
+        responses = job.dest.inlined_responses or []
+        if len(responses) != len(requests):
+            print(f"  Batch job returned {len(responses)} results for {len(requests)} requests")
+            return None
+        return [_extract_image(item.response) for item in responses]
+    except Exception as e:
+        print(f"Batch generation error: {e}")
+        return None
+
+
+async def describe_hero_image(image_path: Path, cache_dir: Optional[Path] = None) -> str:
     """
     Get a detailed description of the hero image for consistency.
     Uses XML-structured prompt and proper content ordering.
+
+    With cache_dir, descriptions are cached by hero content hash so
+    regenerating a job with the same hero skips the vision call.
     """
+    cache_path = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(load_image_as_part(image_path).inline_data.data).hexdigest()
+        cache_path = cache_dir / f".hero_description_{digest}.txt"
+        try:
+            return cache_path.read_text()
+        except FileNotFoundError:
+            pass
+
     try:
         prompt = """<task>
 Describe this architectural photograph in precise detail for use as a reference to ensure consistency in other views of the same building.
@@ -443,35 +588,32 @@ Be specific about proportions, colours, and spatial relationships.
         # Image FIRST, then prompt (per best practices)
         image_part = load_image_as_part(image_path)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
-            contents=[image_part, prompt],  # Image before prompt
-            config=types.GenerateContentConfig(
-                temperature=1.0,  # Gemini 3 recommendation
-            )
+            contents=[image_part, _compact_prompt(prompt)],  # Image before prompt
+            config=_TEXT_CONFIG
         )
 
-        return response.text.strip()
+        description = response.text.strip()
+        if cache_path is not None:
+            # Atomic, so a crash or a concurrent job never leaves a truncated description
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(description)
+            os.replace(tmp_path, cache_path)
+        return description
     except Exception as e:
         print(f"Description error: {e}")
         return "Modern residential building with quality architectural detailing"
 
 
-def verify_image(hero_image_path: str, generated_image_path: str, shot_type: str) -> Dict:
-    """
-    Verify architectural consistency between hero and generated image.
-    Uses XML-structured prompt and proper content ordering.
-    """
-    try:
-        prompt = f"""<task>
+# The verifier rubrics don't depend on the shot, so they're sent as system
+# instructions built once (exterior) or once per project (interior). Every
+# call of a group then shares the same instruction + hero prefix, which
+# Gemini can serve from its implicit prompt cache.
+_EXTERIOR_RUBRIC = """<task>
 Compare these two architectural images and score the consistency of the generated image against the reference.
 </task>
 
-<images>
-- Image 1: Original hero/reference image (the source of truth)
-- Image 2: AI-generated variation ({shot_type})
-</images>
-
 <scoring_criteria>
 Score each criterion from 0-20 points:
 
@@ -484,91 +626,68 @@ Score each criterion from 0-20 points:
 
 <output_format>
 Return ONLY a JSON object:
-{{
+{
     "total_score": <sum of all criteria, 0-100>,
-    "breakdown": {{
+    "breakdown": {
         "building_shape": <0-20>,
         "architectural_style": <0-20>,
         "materials_facade": <0-20>,
         "windows_openings": <0-20>,
         "proportions": <0-20>
-    }},
+    },
     "issues": ["list specific inconsistencies found"],
     "suggestions": ["specific fixes to improve consistency"]
-}}
+}
 </output_format>"""
 
+_EXTERIOR_VERIFY_CONFIG = types.GenerateContentConfig(
+    system_instruction=_compact_prompt(_EXTERIOR_RUBRIC),
+    response_mime_type="application/json",
+    response_schema=EXTERIOR_VERIFICATION_SCHEMA,
+    temperature=1.0,
+)
+
+
+async def verify_image(hero_image: ImageRef, generated_image: types.Blob, shot_type: str) -> Dict:
+    """
+    Verify architectural consistency between hero and generated image.
+    Uses XML-structured prompt and proper content ordering.
+    """
+    try:
+        prompt = f"""<images>
+- Image 1: Original hero/reference image (the source of truth)
+- Image 2: AI-generated variation ({shot_type})
+</images>"""
+
         # Images FIRST, then prompt (per best practices)
-        hero_part = load_image_as_part(hero_image_path)
-        generated_part = load_image_as_part(generated_image_path)
+        hero_part = _as_part(hero_image)
+        # Generated candidates are verified straight from memory, in the format the model returned
+        generated_part = types.Part(inline_data=generated_image)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
-            contents=[hero_part, generated_part, prompt],  # Images before prompt
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=1.0,  # Gemini 3 recommendation
-            )
+            contents=[hero_part, generated_part, _compact_prompt(prompt)],  # Images before prompt
+            config=_EXTERIOR_VERIFY_CONFIG
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        return json.loads(result_text.strip())
+        return parse_response(response)
     except Exception as e:
         print(f"Verification error: {e}")
         return {"total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
 
 
-# Interior shot IDs that need different verification criteria
-INTERIOR_SHOT_IDS = [
-    "interior_living",
-    "interior_kitchen",
-    "interior_master",
-    "interior_bathroom",
-    "spatial_staircase",
-    "spatial_window",
-    "spatial_volume",
-    "lifestyle_morning",
-    "lifestyle_evening",
-]
-
-
-def is_interior_shot(shot_id: str) -> bool:
-    """Check if a shot type is an interior shot."""
-    return shot_id in INTERIOR_SHOT_IDS
-
-
-def verify_interior_image(
-    hero_image_path: str,
-    generated_image_path: str,
-    shot_type: str,
-    parsed: Dict[str, Any]
-) -> Dict:
-    """
-    Verify interior image consistency with project style, not exterior building shape.
-    Interior shots should be verified for style/quality match, not building facade.
-    Uses XML-structured prompt and proper content ordering.
-    """
-    try:
-        # Extract project context for interior verification
-        project_type = parsed.get("project_type", "dual_occupancy")
-        style_keywords = ", ".join(parsed.get("style_keywords", ["modern"]))
-        materials = ", ".join(parsed.get("materials", ["brick", "render"]))
-        finish_level = parsed.get("finish_level", "premium")
-
-        prompt = f"""<task>
+@functools.lru_cache(maxsize=8)
+def _interior_verify_config(
+    project_type: str,
+    style_keywords: str,
+    materials: str,
+    finish_level: str
+) -> types.GenerateContentConfig:
+    """Build the interior rubric for a project once; every interior shot shares it."""
+    rubric = f"""<task>
 Analyze this interior image for quality and style consistency with the project.
 </task>
 
-<context>
-- Image 1: EXTERIOR of a {project_type.replace('_', ' ')} building (style reference only)
-- Image 2: INTERIOR space ({shot_type}) - this is what you are scoring
-</context>
-
 <project_details>
 <type>{project_type.replace('_', ' ').title()}</type>
 <style_keywords>{style_keywords}</style_keywords>
@@ -625,58 +744,415 @@ Return ONLY a JSON object:
     "suggestions": ["specific improvements to make"]
 }}
 </output_format>"""
+    return types.GenerateContentConfig(
+        system_instruction=_compact_prompt(rubric),
+        response_mime_type="application/json",
+        response_schema=INTERIOR_VERIFICATION_SCHEMA,
+        temperature=1.0,
+    )
+
+
+async def verify_interior_image(
+    hero_image: ImageRef,
+    generated_image: types.Blob,
+    shot_type: str,
+    parsed: Dict[str, Any]
+) -> Dict:
+    """
+    Verify interior image consistency with project style, not exterior building shape.
+    Interior shots should be verified for style/quality match, not building facade.
+    Uses XML-structured prompt and proper content ordering.
+    """
+    try:
+        # Extract project context for interior verification
+        project_type = parsed.get("project_type", "dual_occupancy")
+        config = _interior_verify_config(
+            project_type,
+            ", ".join(parsed.get("style_keywords", ["modern"])),
+            ", ".join(parsed.get("materials", ["brick", "render"])),
+            parsed.get("finish_level", "premium")
+        )
+
+        prompt = f"""<context>
+- Image 1: EXTERIOR of a {project_type.replace('_', ' ')} building (style reference only)
+- Image 2: INTERIOR space ({shot_type}) - this is what you are scoring
+</context>"""
 
         # Images FIRST, then prompt (per best practices)
-        hero_part = load_image_as_part(hero_image_path)
-        generated_part = load_image_as_part(generated_image_path)
+        hero_part = _as_part(hero_image)
+        # Generated candidates are verified straight from memory, in the format the model returned
+        generated_part = types.Part(inline_data=generated_image)
 
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
-            contents=[hero_part, generated_part, prompt],  # Images before prompt
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json",
-                temperature=1.0,  # Gemini 3 recommendation
-            )
+            contents=[hero_part, generated_part, _compact_prompt(prompt)],  # Images before prompt
+            config=config
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        return json.loads(result_text.strip())
+        return parse_response(response)
     except Exception as e:
         print(f"Interior verification error: {e}")
         return {"total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
 
 
+def image_fingerprint(img_bytes: bytes) -> Tuple[int, float]:
+    """Return a 64-bit difference hash and the grayscale standard deviation of an image."""
+    with Image.open(io.BytesIO(img_bytes)) as im:
+        gray = im.convert("L")
+        stddev = ImageStat.Stat(gray).stddev[0]
+        pixels = list(gray.resize((9, 8), Image.Resampling.BILINEAR).getdata())
+
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            dhash = (dhash << 1) | (pixels[row * 9 + col] < pixels[row * 9 + col + 1])
+    return dhash, stddev
+
+
+def precheck_image(image_data: bytes, hero_hash: int, same_framing: bool = False) -> Optional[Dict]:
+    """
+    Reject obviously unusable candidates locally, before any Vision call.
+
+    A hash can only prove failure here: most shots are different angles of
+    the building, so similarity to the hero says nothing about consistency.
+    Shots with same_framing (e.g. the twilight hero) are meant to resemble
+    the hero, so only the blank-render check applies to them.
+    Returns a failing verification result, or None if the image needs a
+    real verification.
+    """
+    try:
+        dhash, stddev = image_fingerprint(image_data)
+    except Exception as e:
+        return {"total_score": 0, "breakdown": {}, "issues": [f"Unreadable image: {e}"], "suggestions": []}
+
+    if stddev < MIN_IMAGE_STDDEV:
+        issue = "Image is blank or near-uniform"
+        suggestion = "Render the complete scene described in the shot specification"
+    elif not same_framing and bin(dhash ^ hero_hash).count("1") <= ECHO_HASH_DISTANCE:
+        issue = "Image repeats the reference instead of showing the requested view"
+        suggestion = "Change the camera angle and framing to match the shot specification"
+    else:
+        return None
+    return {"total_score": 0, "breakdown": {}, "issues": [issue], "suggestions": [suggestion]}
+
+
+async def verify_images_batch(
+    hero_image_path: Path,
+    generated_images: List[types.Blob],
+    shot_types: List[str]
+) -> Optional[List[Dict]]:
+    """
+    Verify several exterior shots against the hero in a single vision call.
+
+    The hero and every candidate are sent once, as thumbnails, and the model
+    returns one score object per candidate in order. Returns None if the call
+    fails or the response doesn't line up, so callers can verify one by one.
+    """
+    try:
+        image_list = "\n".join(
+            f"- Image {n}: AI-generated variation ({shot_type})"
+            for n, shot_type in enumerate(shot_types, start=2)
+        )
+        prompt = f"""<task>
+Compare each generated architectural image against the reference and score its consistency.
+</task>
+
+<images>
+- Image 1: Original hero/reference image (the source of truth)
+{image_list}
+</images>
+
+<scoring_criteria>
+Score each generated image on each criterion from 0-20 points:
+
+1. BUILDING_SHAPE (0-20): Does the silhouette and overall form match?
+2. ARCHITECTURAL_STYLE (0-20): Is the design language consistent?
+3. MATERIALS_FACADE (0-20): Are materials, colours, and textures the same?
+4. WINDOWS_OPENINGS (0-20): Do window patterns and placements match?
+5. PROPORTIONS (0-20): Are scale and dimensional relationships correct?
+</scoring_criteria>
+
+<output_format>
+Return ONLY a JSON object with one entry per generated image, in image order:
+{{
+    "scores": [
+        {{
+            "shot_type": "<shot type>",
+            "total_score": <sum of all criteria, 0-100>,
+            "breakdown": {{
+                "building_shape": <0-20>,
+                "architectural_style": <0-20>,
+                "materials_facade": <0-20>,
+                "windows_openings": <0-20>,
+                "proportions": <0-20>
+            }},
+            "issues": ["list specific inconsistencies found"],
+            "suggestions": ["specific fixes to improve consistency"]
+        }}
+    ]
+}}
+</output_format>"""
+
+        # Images FIRST, then prompt (per best practices)
+        hero_bytes = load_image_as_part(hero_image_path).inline_data.data
+        parts = await asyncio.to_thread(
+            lambda: [thumb_part(hero_bytes), *(thumb_part(image.data) for image in generated_images)]
+        )
+
+        response = await _generate_content(
+            model=VISION_MODEL,
+            contents=[*parts, _compact_prompt(prompt)],  # Images before prompt
+            config=_BATCH_VERIFY_CONFIG
+        )
+
+        scores = parse_response(response).get("scores", [])
+        if len(scores) != len(generated_images):
+            print(f"Batch verification returned {len(scores)} scores for {len(generated_images)} images")
+            return None
+        return scores
+    except Exception as e:
+        print(f"Batch verification error: {e}")
+        return None
+
+
 def build_fixing_prompt(verification_result: Dict) -> str:
     """Build an XML-structured fixing prompt from verification results."""
-    lines = ["<fixes_required>"]
     breakdown = verification_result.get("breakdown", {})
+    return "\n".join(itertools.chain(
+        ("<fixes_required>",),
+        (
+            f"<fix criterion='{criterion}' score='{score}/20'>Improve this aspect significantly</fix>"
+            for criterion, score in breakdown.items()
+            if score < 16  # Below 80% for this criterion
+        ),
+        (f"<issue>{issue}</issue>" for issue in verification_result.get("issues", [])),
+        (f"<suggestion>{suggestion}</suggestion>" for suggestion in verification_result.get("suggestions", [])),
+        ("</fixes_required>",),
+    ))
+
+
+async def save_image(path: Path, data: bytes):
+    """Write image bytes without blocking the event loop."""
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(data)
+
+
+async def generate_shot_image(
+    variation_prompt: str,
+    hero: ImageRef,
+    aspect_ratio: str,
+    fixing_prompt: Optional[str] = None
+) -> Optional[types.Blob]:
+    """Generate one candidate for a shot with the hero as reference."""
+    if fixing_prompt:
+        variation_prompt += f"\n\n{fixing_prompt}"
+
+    return await generate_image(
+        variation_prompt,
+        hero,
+        aspect_ratio=aspect_ratio
+    )
 
-    for criterion, score in breakdown.items():
-        if score < 16:  # Below 80% for this criterion
-            lines.append(f"<fix criterion='{criterion}' score='{score}/20'>Improve this aspect significantly</fix>")
 
-    for issue in verification_result.get("issues", []):
-        lines.append(f"<issue>{issue}</issue>")
+async def verify_shot_image(
+    image: types.Blob,
+    shot_id: str,
+    parsed: Dict[str, Any],
+    hero: ImageRef,
+    interior: bool,
+    hero_hash: Optional[int] = None
+) -> Dict:
+    """
+    Verify a single candidate, using the interior rubric for interior shots.
+
+    With hero_hash, candidates that fail the local pre-check skip the Vision call.
+    """
+    if hero_hash is not None:
+        shot = get_shot_by_id(shot_id)
+        # Decoding a full-size candidate would stall the other shots on the event loop
+        rejection = await asyncio.to_thread(
+            precheck_image, image.data, hero_hash, shot is not None and shot.same_framing
+        )
+        if rejection:
+            print(f"  [{shot_id}] Pre-check failed: {rejection['issues'][0]}")
+            return rejection
+    if interior:
+        # Interior shots: verify style/quality consistency, not building shape
+        print(f"  [{shot_id}] Interior verification - style/quality criteria")
+        return await verify_interior_image(hero, image, shot_id, parsed)
+    # Exterior shots: verify building shape/facade consistency
+    return await verify_image(hero, image, shot_id)
+
+
+async def process_shot(
+    shot: ShotType,
+    variation_prompt: str,
+    aspect_ratio: str,
+    interior: bool,
+    store: JobStore,
+    parsed: Dict[str, Any],
+    hero: ImageRef,
+    hero_hash: Optional[int],
+    timestamp: str,
+    total_shots: int,
+    sem: asyncio.Semaphore,
+    verify_sem: asyncio.Semaphore,
+    progress: Dict[str, int],
+    first_attempt: Optional[Tuple[Optional[types.Blob], Optional[Dict]]] = None,
+    max_attempts: int = MAX_REGEN_ATTEMPTS,
+    parallel_retries: bool = False,
+) -> bool:
+    """
+    Generate, verify and save a single non-hero shot. Returns True if an image was saved.
+
+    variation_prompt is built once per shot; retries only append a fixing prompt.
+    first_attempt carries a candidate generated and verified up front.
+    max_attempts caps regeneration for shots outside the job's regen budget.
+    With parallel_retries, all retries after the first attempt are generated
+    at once from its fixing prompt and the best candidate wins, instead of
+    refining one candidate at a time.
+    """
+    shot_name = shot.name
+    shot_id = shot.id
+    category = shot.category
+
+    attempts = 0
+    best_score = 0
+    best_image = None
+    best_breakdown = None
+    low_confidence = False
+    fixing_prompt = None
+    prev_score = None
+
+    async def generate_and_verify(
+        fixing_prompt: Optional[str]
+    ) -> Tuple[Optional[types.Blob], Optional[Dict]]:
+        store.update_status({
+            "status": "generating",
+            "progress": int((progress["completed"] / total_shots) * 100),
+            "currentImage": progress["completed"] + 1,
+            "totalImages": total_shots,
+            "currentVariation": shot_id,
+            "message": f"Generating {shot_name}..."
+        })
+        async with sem:
+            image = await generate_shot_image(variation_prompt, hero, aspect_ratio, fixing_prompt)
+        if not image:
+            return None, None
+
+        store.update_status({
+            "status": "verifying",
+            "message": f"Verifying {shot_name}..."
+        })
+        async with verify_sem:
+            verification = await verify_shot_image(image, shot_id, parsed, hero, interior, hero_hash)
+        return image, verification
+
+    sequential_attempts = 1 if parallel_retries else max_attempts
+    while attempts < sequential_attempts:
+        attempts += 1
+        print(f"  [{shot_id}] Attempt {attempts}/{max_attempts}")
+
+        if attempts == 1 and first_attempt is not None:
+            image, verification = first_attempt
+            if image and verification is None:
+                async with verify_sem:
+                    verification = await verify_shot_image(
+                        image, shot_id, parsed, hero, interior, hero_hash
+                    )
+        else:
+            image, verification = await generate_and_verify(fixing_prompt)
 
-    for suggestion in verification_result.get("suggestions", []):
-        lines.append(f"<suggestion>{suggestion}</suggestion>")
+        if not image:
+            print(f"  [{shot_id}] Failed to generate image")
+            continue
 
-    lines.append("</fixes_required>")
-    return "\n".join(lines)
+        score = verification.get("total_score", 0)
+        print(f"  [{shot_id}] Verification score: {score}/100")
+
+        if score > best_score:
+            best_score = score
+            best_image = image
+            best_breakdown = verification.get("breakdown", {})
+
+        if score > VERIFICATION_THRESHOLD:
+            print(f"  [{shot_id}] PASSED (>{VERIFICATION_THRESHOLD}%)")
+            break
+        elif prev_score is not None and score - prev_score < MIN_SCORE_GAIN:
+            # Fixing prompts aren't moving the score; another try is unlikely to pass
+            print(f"  [{shot_id}] Score plateaued ({prev_score} -> {score}), stopping retries")
+            break
+        elif attempts < max_attempts:
+            print(f"  [{shot_id}] FAILED (<={VERIFICATION_THRESHOLD}%), building fixing prompt...")
+            fixing_prompt = build_fixing_prompt(verification)
+        prev_score = score
+
+    if parallel_retries and best_score <= VERIFICATION_THRESHOLD and attempts < max_attempts:
+        remaining = max_attempts - attempts
+        print(f"  [{shot_id}] Generating {remaining} candidates in parallel...")
+        candidates = await asyncio.gather(*(
+            generate_and_verify(fixing_prompt) for _ in range(remaining)
+        ))
+        attempts = max_attempts
+        for image, verification in candidates:
+            score = verification.get("total_score", 0) if image else 0
+            if score > best_score:
+                best_score = score
+                best_image = image
+                best_breakdown = verification.get("breakdown", {})
+        print(f"  [{shot_id}] Best of {remaining} parallel candidates: {best_score}/100")
+
+    # Save the best image we got
+    if not best_image:
+        print(f"  [{shot_id}] SKIPPED - no image generated")
+        return False
+
+    if best_score <= VERIFICATION_THRESHOLD:
+        low_confidence = True
+        print(f"  [{shot_id}] Saving as LOW CONFIDENCE (best score: {best_score})")
+
+    # Name the file after the format the model actually returned
+    extension = EXTENSIONS.get(best_image.mime_type, ".png")
+    filename = f"{shot_id}_{timestamp}{extension}"
+    final_path = store.output_dir / filename
+
+    # Other shots keep running on the event loop while the file is written
+    await save_image(final_path, best_image.data)
+
+    # JobStore updates are synchronous with no await inside, so concurrent
+    # shots can't interleave them on the event loop
+    progress["completed"] += 1
+    image_entry = {
+        "id": f"{store.job_id}_{progress['completed']}",
+        "filename": filename,
+        "url": f"/api/images/{store.job_id}/{filename}",
+        "variationType": shot_id,
+        "category": category,
+        "name": shot_name,
+        "isHero": False,
+        "consistencyScore": best_score,
+        "attempts": attempts,
+        "lowConfidence": low_confidence,
+        "scoreBreakdown": best_breakdown,
+        "aspectRatio": aspect_ratio,
+        "created_at": datetime.now().isoformat()
+    }
+    store.add_image(image_entry)
+    print(f"  [{shot_id}] Saved: {filename}")
+    return True
 
 
-def main(
+async def main(
     user_prompt: str,
     output_dir: str,
     job_id: str,
     project_type: Optional[str] = None,
     suburb_override: Optional[str] = None,
-    from_hero: Optional[str] = None
+    from_hero: Optional[str] = None,
+    hero_description: Optional[str] = None,
+    concurrency: int = GENERATION_CONCURRENCY,
+    use_batch: bool = False,
+    parallel_retries: bool = False
 ):
     """Main generation workflow.
 
@@ -687,6 +1163,10 @@ def main(
         project_type: Optional override for project type (from dropdown)
         suburb_override: Optional override for suburb (from dropdown)
         from_hero: Optional path to pre-approved hero image (skips hero generation)
+        hero_description: Optional description of the pre-approved hero (skips describing it)
+        concurrency: Maximum number of shots with a Gemini call in flight
+        use_batch: Generate the first round of variations through Gemini Batch Mode
+        parallel_retries: Regenerate failing shots as parallel candidates (best-of-N)
     """
     print(f"Starting project generation for job {job_id}")
     print(f"User prompt: {user_prompt[:100]}...")
@@ -698,321 +1178,318 @@ def main(
     if from_hero:
         print(f"Using pre-approved hero: {from_hero}")
 
-    # Create output directory
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-    # Initial status
-    update_status(job_id, output_dir, {
-        "status": "parsing",
-        "progress": 2,
-        "currentImage": 0,
-        "totalImages": 18,
-        "message": "Analyzing project description...",
-        "prompt": user_prompt,
-        "model": IMAGE_MODEL
-    })
-
-    # Parse user prompt
-    print("\n[1/4] Parsing user prompt...")
-    parsed = parse_user_prompt(user_prompt)
-
-    # Override with dropdown values if provided
-    if project_type:
-        parsed["project_type"] = project_type
-        print(f"  Project type (override): {project_type}")
-    else:
-        print(f"  Project type (parsed): {parsed.get('project_type')}")
+    async with JobStore(job_id, output_dir) as store:
+        # Initial status
+        store.update_status({
+            "status": "parsing",
+            "progress": 2,
+            "currentImage": 0,
+            "totalImages": 18,
+            "message": "Analyzing project description...",
+            "prompt": user_prompt,
+            "model": IMAGE_MODEL
+        })
 
-    if suburb_override:
-        parsed["suburb"] = suburb_override
-        print(f"  Suburb (override): {suburb_override}")
-    else:
-        print(f"  Suburb (parsed): {parsed.get('suburb')}")
+        # Parse user prompt
+        print("\n[1/4] Parsing user prompt...")
+        parsed = await parse_user_prompt(user_prompt)
 
-    print(f"  Style: {parsed.get('style_keywords')}")
+        # Override with dropdown values if provided
+        if project_type:
+            parsed["project_type"] = project_type
+            print(f"  Project type (override): {project_type}")
+        else:
+            print(f"  Project type (parsed): {parsed.get('project_type')}")
 
-    # Determine total shots based on project type (multi-unit gets +2 extra)
-    project_type_final = parsed.get("project_type", "dual_occupancy")
-    num_units = parsed.get("num_units", 2) or 2
-    shots_list = get_shots_for_project_type(project_type_final, num_units)
-    total_shots = len(shots_list)
+        if suburb_override:
+            parsed["suburb"] = suburb_override
+            print(f"  Suburb (override): {suburb_override}")
+        else:
+            print(f"  Suburb (parsed): {parsed.get('suburb')}")
 
-    # Check if multi-unit project
-    is_multi_unit = project_type_final == "apartments" or (
-        project_type_final == "townhouses" and num_units >= 3
-    )
-    if is_multi_unit:
-        print(f"  Multi-unit project detected: {total_shots} images (18 base + 2 multi-unit)")
-    else:
-        print(f"  Standard project: {total_shots} images")
-
-    # Update status with correct total
-    update_status(job_id, output_dir, {
-        "totalImages": total_shots,
-        "message": "Project parsed, starting generation..."
-    })
-
-    # Get suburb context
-    suburb = parsed.get("suburb") or "balwyn"  # Default to Balwyn (SQM's area)
-    suburb_context = build_suburb_context_prompt(suburb)
-
-    # Save parsed info to manifest
-    manifest_path = Path(output_dir) / "manifest.json"
-    manifest = {
-        "job_id": job_id,
-        "type": "project_showcase",
-        "prompt": user_prompt,
-        "parsed": parsed,
-        "suburb": suburb,
-        "model": IMAGE_MODEL,
-        "created_at": datetime.now().isoformat(),
-        "images": []
-    }
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+        print(f"  Style: {parsed.get('style_keywords')}")
 
-    # Generate or use pre-approved hero image
-    hero_aspect_ratio = get_aspect_ratio_for_shot("hero_facade")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Determine total shots based on project type (multi-unit gets +2 extra)
+        project_type_final = parsed.get("project_type", "dual_occupancy")
+        num_units = parsed.get("num_units", 2) or 2
+        shots_list = get_shots_for_project_type(project_type_final, num_units)
+        total_shots = len(shots_list)
 
-    if from_hero and os.path.exists(from_hero):
-        # Use pre-approved hero image (from inspiration flow)
-        print("\n[2/4] Using pre-approved hero image...")
-        update_status(job_id, output_dir, {
-            "status": "generating",
-            "progress": 10,
-            "currentImage": 1,
-            "totalImages": total_shots,
-            "currentVariation": "hero_facade",
-            "message": "Using approved hero image..."
-        })
-
-        hero_path = Path(from_hero)
-        hero_filename = hero_path.name
-
-        # If hero is not already in output dir, copy it
-        output_hero_path = Path(output_dir) / hero_filename
-        if str(hero_path) != str(output_hero_path):
-            import shutil
-            shutil.copy2(hero_path, output_hero_path)
-            hero_path = output_hero_path
-
-        print(f"  Using hero image: {hero_filename}")
-
-        # Add hero to manifest (it may already be there from inspiration flow)
-        hero_entry = {
-            "id": f"{job_id}_1",
-            "filename": hero_filename,
-            "url": f"/api/images/{job_id}/{hero_filename}",
-            "variationType": "hero_facade",
-            "category": "hero_shots",
-            "name": "Primary Facade",
-            "isHero": True,
-            "consistencyScore": 100,
-            "attempts": 1,
-            "lowConfidence": False,
-            "aspectRatio": hero_aspect_ratio,
-            "created_at": datetime.now().isoformat()
-        }
-
-        # Check if manifest already has images (from inspiration flow)
-        manifest_path = Path(output_dir) / "manifest.json"
-        if manifest_path.exists():
-            with open(manifest_path, "r") as f:
-                existing_manifest = json.load(f)
-            # Only add hero if not already in images
-            if not any(img.get("isHero") for img in existing_manifest.get("images", [])):
-                save_image_to_manifest(job_id, output_dir, hero_entry)
+        if is_multi_unit_project(project_type_final, num_units):
+            print(f"  Multi-unit project detected: {total_shots} images (18 base + 2 multi-unit)")
         else:
-            save_image_to_manifest(job_id, output_dir, hero_entry)
+            print(f"  Standard project: {total_shots} images")
 
-    else:
-        # Generate new hero image
-        print("\n[2/4] Generating hero image...")
-        update_status(job_id, output_dir, {
-            "status": "generating_hero",
-            "progress": 5,
-            "currentImage": 1,
-            "totalImages": 18,
-            "currentVariation": "hero_facade",
-            "message": "Generating primary facade (hero image)..."
+        # Update status with correct total
+        store.update_status({
+            "totalImages": total_shots,
+            "message": "Project parsed, starting generation..."
         })
 
-        hero_prompt = build_hero_generation_prompt(user_prompt, parsed, suburb_context)
-        hero_image_data = generate_image(hero_prompt, aspect_ratio=hero_aspect_ratio)
+        # Get suburb context
+        suburb = parsed.get("suburb") or "balwyn"  # Default to Balwyn (SQM's area)
+        suburb_context = build_suburb_context_prompt(suburb)
+
+        # One clock read names every file and dates the manifest
+        started = datetime.now()
+        timestamp = started.strftime("%Y%m%d_%H%M%S")
+
+        # Save parsed info to manifest
+        store.set_manifest({
+            "job_id": job_id,
+            "type": "project_showcase",
+            "prompt": user_prompt,
+            "parsed": parsed,
+            "suburb": suburb,
+            "model": IMAGE_MODEL,
+            "created_at": started.isoformat(),
+            "images": []
+        })
 
-        if not hero_image_data:
-            print("  ERROR: Failed to generate hero image")
-            update_status(job_id, output_dir, {
-                "status": "error",
-                "message": "Failed to generate hero image"
+        # Generate or use pre-approved hero image
+        hero_aspect_ratio = get_hero_shot().aspect_ratio
+
+        if from_hero and os.path.exists(from_hero):
+            # Use pre-approved hero image (from inspiration flow)
+            print("\n[2/4] Using pre-approved hero image...")
+            store.update_status({
+                "status": "generating",
+                "progress": 10,
+                "currentImage": 1,
+                "totalImages": total_shots,
+                "currentVariation": "hero_facade",
+                "message": "Using approved hero image..."
             })
-            return
-
-        # Save hero image
-        hero_filename = f"hero_facade_{timestamp}.png"
-        hero_path = Path(output_dir) / hero_filename
-
-        with open(hero_path, "wb") as f:
-            f.write(hero_image_data)
-
-        print(f"  Saved hero image: {hero_filename}")
-
-        # Add hero to manifest
-        hero_entry = {
-            "id": f"{job_id}_1",
-            "filename": hero_filename,
-            "url": f"/api/images/{job_id}/{hero_filename}",
-            "variationType": "hero_facade",
-            "category": "hero_shots",
-            "name": "Primary Facade",
-            "isHero": True,
-            "consistencyScore": 100,  # Hero is always 100% consistent with itself
-            "attempts": 1,
-            "lowConfidence": False,
-            "aspectRatio": hero_aspect_ratio,
-            "created_at": datetime.now().isoformat()
-        }
-        save_image_to_manifest(job_id, output_dir, hero_entry)
-
-    # Get hero description for consistency
-    print("\n[3/4] Analyzing hero image for consistency reference...")
-    hero_description = describe_hero_image(str(hero_path))
-    print(f"  Description: {hero_description[:200]}...")
-
-    # Generate remaining shots
-    print("\n[4/4] Generating showcase package...")
-    # Use pre-calculated shots_list (includes multi-unit extras if applicable)
-    completed = 1  # Hero already done
 
-    for i, shot in enumerate(shots_list):
-        # Skip hero_facade as it's already done
-        if shot["id"] == "hero_facade":
-            continue
+            hero_path = Path(from_hero)
+            hero_filename = hero_path.name
+
+            # If hero is not already in output dir, copy it
+            output_hero_path = store.output_dir / hero_filename
+            if hero_path != output_hero_path:
+                await asyncio.to_thread(shutil.copy2, hero_path, output_hero_path)
+                hero_path = output_hero_path
+
+            print(f"  Using hero image: {hero_filename}")
+
+            # Add hero to manifest (it may already be there from inspiration flow)
+            hero_entry = {
+                "id": f"{job_id}_1",
+                "filename": hero_filename,
+                "url": f"/api/images/{job_id}/{hero_filename}",
+                "variationType": "hero_facade",
+                "category": "hero_shots",
+                "name": "Primary Facade",
+                "isHero": True,
+                "consistencyScore": 100,
+                "attempts": 1,
+                "lowConfidence": False,
+                "aspectRatio": hero_aspect_ratio,
+                "created_at": datetime.now().isoformat()
+            }
 
-        shot_name = shot["name"]
-        shot_id = shot["id"]
-        category = shot["category"]
-        aspect_ratio = get_aspect_ratio_for_shot(shot_id)
+            # Only add hero if not already in images
+            if not any(img.get("isHero") for img in store.manifest["images"]):
+                store.add_image(hero_entry)
 
-        print(f"\n[{completed + 1}/{total_shots}] Generating {shot_name} ({aspect_ratio})...")
+        else:
+            # Generate new hero image
+            print("\n[2/4] Generating hero image...")
+            store.update_status({
+                "status": "generating_hero",
+                "progress": 5,
+                "currentImage": 1,
+                "totalImages": 18,
+                "currentVariation": "hero_facade",
+                "message": "Generating primary facade (hero image)..."
+            })
 
-        update_status(job_id, output_dir, {
+            hero_prompt = build_hero_generation_prompt(user_prompt, parsed, suburb_context)
+            hero_image_data = await generate_image(hero_prompt, aspect_ratio=hero_aspect_ratio)
+
+            if not hero_image_data:
+                print("  ERROR: Failed to generate hero image")
+                store.update_status({
+                    "status": "error",
+                    "message": "Failed to generate hero image",
+                    "apiRetries": get_retry_count()
+                })
+                return
+
+            # Save hero image
+            hero_filename = f"hero_facade_{timestamp}{EXTENSIONS.get(hero_image_data.mime_type, '.png')}"
+            hero_path = store.output_dir / hero_filename
+
+            await save_image(hero_path, hero_image_data.data)
+
+            print(f"  Saved hero image: {hero_filename}")
+
+            # Add hero to manifest
+            hero_entry = {
+                "id": f"{job_id}_1",
+                "filename": hero_filename,
+                "url": f"/api/images/{job_id}/{hero_filename}",
+                "variationType": "hero_facade",
+                "category": "hero_shots",
+                "name": "Primary Facade",
+                "isHero": True,
+                "consistencyScore": 100,  # Hero is always 100% consistent with itself
+                "attempts": 1,
+                "lowConfidence": False,
+                "aspectRatio": hero_aspect_ratio,
+                "created_at": datetime.now().isoformat()
+            }
+            store.add_image(hero_entry)
+
+        # Get hero description for consistency
+        print("\n[3/4] Analyzing hero image for consistency reference...")
+        if not (hero_description and from_hero):
+            hero_description = await describe_hero_image(hero_path, cache_dir=store.output_dir)
+
+        # Upload the hero once and reference it from every shot's generation and
+        # verification instead of re-sending the image bytes each time
+        hero_ref = await upload_reference(hero_path) or hero_path
+        hero_hash, _ = image_fingerprint(hero_path.read_bytes())
+        print(f"  Description: {hero_description[:200]}...")
+
+        # Generate remaining shots
+        print("\n[4/4] Generating showcase package...")
+        # Use pre-calculated shots_list (includes multi-unit extras if applicable).
+        # Non-hero shots only depend on the hero, so run them concurrently.
+        # Generation and verification have separate semaphores so verifying one
+        # shot never waits behind another shot's generation
+        sem = asyncio.Semaphore(concurrency)
+        verify_sem = asyncio.Semaphore(concurrency)
+        progress = {"completed": 1}  # Hero already done
+        # Skip hero_facade as it's already done
+        variation_shots = [shot for shot in shots_list if shot.id != "hero_facade"]
+        # Aspect ratio and interior/exterior are fixed per shot, so resolve them
+        # once instead of on every attempt
+        aspect_ratios = [shot.aspect_ratio for shot in variation_shots]
+        interiors = [shot.is_interior for shot in variation_shots]
+        # Prompts are fixed per shot too; retries append a fixing prompt to these
+        variation_prompts = [
+            build_variation_prompt(shot, parsed, suburb_context, hero_description)
+            for shot in variation_shots
+        ]
+
+        # First round: one candidate per shot
+        store.update_status({
             "status": "generating",
-            "progress": int((completed / total_shots) * 100),
-            "currentImage": completed + 1,
+            "progress": int((1 / total_shots) * 100),
+            "currentImage": 2,
             "totalImages": total_shots,
-            "currentVariation": shot_id,
-            "message": f"Generating {shot_name}..."
+            "message": f"Generating {len(variation_shots)} shots..."
         })
 
-        attempts = 0
-        best_score = 0
-        best_image_data = None
-        best_breakdown = None
-        low_confidence = False
-        fixing_prompt = None
-
-        while attempts < MAX_REGEN_ATTEMPTS:
-            attempts += 1
-            print(f"  Attempt {attempts}/{MAX_REGEN_ATTEMPTS}")
-
-            # Build variation prompt
-            variation_prompt = build_variation_prompt(shot, parsed, suburb_context, hero_description)
-
-            if fixing_prompt:
-                variation_prompt += f"\n\n{fixing_prompt}"
-
-            # Generate image with hero as reference
-            image_data = generate_image(
-                variation_prompt,
-                str(hero_path),
-                aspect_ratio=aspect_ratio
+        async def first_candidate(n: int) -> Tuple[Optional[types.Blob], Optional[Dict]]:
+            async with sem:
+                image = await generate_shot_image(variation_prompts[n], hero_ref, aspect_ratios[n])
+            verification = None
+            if image and interiors[n]:
+                # Interiors aren't batch-verified, so verify each one as soon as it
+                # is ready while other shots are still generating
+                async with verify_sem:
+                    verification = await verify_shot_image(
+                        image, variation_shots[n].id, parsed, hero_ref, True, hero_hash
+                    )
+            return image, verification
+
+        first_images = None
+        first_verifications: List[Optional[Dict]] = [None] * len(variation_shots)
+        if use_batch:
+            # The hero stays on the single-call path; only variations are batched
+            first_images = await generate_images_batch(
+                list(zip(variation_prompts, aspect_ratios)),
+                hero_ref
             )
-
-            if not image_data:
-                print(f"  Failed to generate image")
-                continue
-
-            # Save temporarily for verification
-            temp_path = Path(output_dir) / f"temp_{shot_id}.png"
-            with open(temp_path, "wb") as f:
-                f.write(image_data)
-
-            # Verify consistency with hero
-            # Use different verification criteria for interior shots
-            update_status(job_id, output_dir, {
+            if first_images is None:
+                print("  Batch generation unavailable, generating shots individually")
+        if first_images is None:
+            candidates = await asyncio.gather(*(first_candidate(n) for n in range(len(variation_shots))))
+            first_images = [image for image, _ in candidates]
+            first_verifications = [verification for _, verification in candidates]
+
+        # Exteriors that fail the local pre-check don't need a Vision call;
+        # the candidates are decoded in worker threads
+        prechecked = [n for n in range(len(variation_shots)) if first_images[n] and not interiors[n]]
+        rejections = await asyncio.gather(*(
+            asyncio.to_thread(precheck_image, first_images[n].data, hero_hash, variation_shots[n].same_framing)
+            for n in prechecked
+        ))
+        for n, rejection in zip(prechecked, rejections):
+            first_verifications[n] = rejection
+
+        # Verify all exterior candidates against the hero in one call; interiors
+        # use a different rubric and are verified individually
+        batch_indexes = [
+            n for n in range(len(variation_shots))
+            if first_images[n] and not interiors[n] and first_verifications[n] is None
+        ]
+        if batch_indexes:
+            store.update_status({
                 "status": "verifying",
-                "message": f"Verifying {shot_name}..."
+                "message": f"Verifying {len(batch_indexes)} shots..."
             })
-
-            if is_interior_shot(shot_id):
-                # Interior shots: verify style/quality consistency, not building shape
-                verification = verify_interior_image(str(hero_path), str(temp_path), shot_id, parsed)
-                print(f"  [Interior verification - style/quality criteria]")
-            else:
-                # Exterior shots: verify building shape/facade consistency
-                verification = verify_image(str(hero_path), str(temp_path), shot_id)
-            score = verification.get("total_score", 0)
-            print(f"  Verification score: {score}/100")
-
-            if score > best_score:
-                best_score = score
-                best_image_data = image_data
-                best_breakdown = verification.get("breakdown", {})
-
-            # Clean up temp file
-            temp_path.unlink(missing_ok=True)
-
-            if score > VERIFICATION_THRESHOLD:
-                print(f"  PASSED (>{VERIFICATION_THRESHOLD}%)")
-                break
-            else:
-                print(f"  FAILED (<={VERIFICATION_THRESHOLD}%), building fixing prompt...")
-                fixing_prompt = build_fixing_prompt(verification)
-
-        # Save the best image we got
-        if best_image_data:
-            if best_score <= VERIFICATION_THRESHOLD:
-                low_confidence = True
-                print(f"  Saving as LOW CONFIDENCE (best score: {best_score})")
-
-            filename = f"{shot_id}_{timestamp}.png"
-            final_path = Path(output_dir) / filename
-
-            with open(final_path, "wb") as f:
-                f.write(best_image_data)
-
-            # Add to manifest
-            image_entry = {
-                "id": f"{job_id}_{completed + 1}",
-                "filename": filename,
-                "url": f"/api/images/{job_id}/{filename}",
-                "variationType": shot_id,
-                "category": category,
-                "name": shot_name,
-                "isHero": False,
-                "consistencyScore": best_score,
-                "attempts": attempts,
-                "lowConfidence": low_confidence,
-                "scoreBreakdown": best_breakdown,
-                "aspectRatio": aspect_ratio,
-                "created_at": datetime.now().isoformat()
-            }
-            save_image_to_manifest(job_id, output_dir, image_entry)
-            completed += 1
-            print(f"  Saved: {filename}")
-        else:
-            print(f"  SKIPPED - no image generated")
-
-    # Final status
-    update_status(job_id, output_dir, {
-        "status": "complete",
-        "progress": 100,
-        "currentImage": total_shots,
-        "totalImages": total_shots,
-        "message": f"Generated {completed} images"
-    })
+            batch_scores = await verify_images_batch(
+                hero_path,
+                [first_images[n] for n in batch_indexes],
+                [variation_shots[n].id for n in batch_indexes]
+            )
+            # Trust the batch score; a shot whose entry is unusable stays None
+            # and is verified on its own below
+            for n, verification in zip(batch_indexes, batch_scores or []):
+                if isinstance(verification, dict) and isinstance(verification.get("total_score"), int):
+                    first_verifications[n] = verification
+
+        async def settle_first_verification(n: int) -> Optional[Dict]:
+            """Verify on its own any candidate the batch couldn't score."""
+            image, verification = first_images[n], first_verifications[n]
+            if image and verification is None:
+                async with verify_sem:
+                    verification = await verify_shot_image(
+                        image, variation_shots[n].id, parsed, hero_ref, interiors[n], hero_hash
+                    )
+            return verification
+
+        first_verifications = await asyncio.gather(*(
+            settle_first_verification(n) for n in range(len(variation_shots))
+        ))
+
+        # Spend regeneration only on the worst failing shots (failed generations first)
+        def first_score(n: int) -> int:
+            verification = first_verifications[n]
+            return verification.get("total_score", 0) if first_images[n] and verification else -1
+
+        failing = sorted(
+            (n for n in range(len(variation_shots)) if first_score(n) <= VERIFICATION_THRESHOLD),
+            key=first_score
+        )
+        regen_indexes = set(failing[:MAX_REGEN_BUDGET])
+        if len(failing) > len(regen_indexes):
+            print(f"  {len(failing)} shots below threshold; regenerating the worst {len(regen_indexes)}")
+
+        await asyncio.gather(*(
+            process_shot(
+                shot, variation_prompts[n], aspect_ratios[n], interiors[n], store, parsed,
+                hero_ref, hero_hash, timestamp, total_shots, sem, verify_sem, progress,
+                first_attempt=(first_images[n], first_verifications[n]),
+                max_attempts=MAX_REGEN_ATTEMPTS if n in regen_indexes else 1,
+                parallel_retries=parallel_retries
+            )
+            for n, shot in enumerate(variation_shots)
+        ))
+        completed = progress["completed"]
+
+        # Final status
+        store.update_status({
+            "status": "complete",
+            "progress": 100,
+            "currentImage": total_shots,
+            "totalImages": total_shots,
+            "message": f"Generated {completed} images",
+            "apiRetries": get_retry_count()
+        })
 
     print(f"\nComplete! Generated {completed}/{total_shots} images")
 
@@ -1037,14 +1514,38 @@ if __name__ == "__main__":
         "--from-hero",
         help="Path to pre-approved hero image (skips hero generation)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=GENERATION_CONCURRENCY,
+        help="Maximum concurrent Gemini calls (default: GENERATION_CONCURRENCY or 5)"
+    )
+    parser.add_argument(
+        "--use-batch",
+        action="store_true",
+        help="Submit first-round variations as one Gemini batch job (cheaper, slower to start)"
+    )
+    parser.add_argument(
+        "--parallel-retries",
+        action="store_true",
+        help="Regenerate failing shots as parallel candidates and keep the best (faster, more API calls)"
+    )
+    parser.add_argument(
+        "--hero-description",
+        help="Description of the pre-approved hero (skips hero analysis)"
+    )
 
     args = parser.parse_args()
 
-    main(
+    event_loop.run(main(
         user_prompt=args.prompt,
         output_dir=args.output_dir,
         job_id=args.job_id,
         project_type=args.project_type,
         suburb_override=args.suburb,
-        from_hero=args.from_hero
-    )
+        from_hero=args.from_hero,
+        hero_description=args.hero_description,
+        concurrency=max(1, args.concurrency),
+        use_batch=args.use_batch,
+        parallel_retries=args.parallel_retries
+    ))
@@ -0,0 +1,39 @@
+"""
+Image helpers shared by the generation and regeneration scripts.
+
+MIME_TYPES maps file suffixes to the MIME types sent to Gemini, and
+EXTENSIONS maps a returned image's MIME type back to the suffix it is
+saved under.
+"""
+
+import io
+from types import MappingProxyType
+
+from google.genai import types
+from PIL import Image
+
+MIME_TYPES = MappingProxyType({
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+})
+
+# First suffix wins, so JPEGs are saved as .jpg
+EXTENSIONS = MappingProxyType({mime: ext for ext, mime in reversed(MIME_TYPES.items())})
+
+# Longest edge of the thumbnails sent to the verifiers
+VERIFY_MAX_EDGE = 1024
+
+
+def thumb_part(img_bytes: bytes) -> types.Part:
+    """Downscale an image to VERIFY_MAX_EDGE and re-encode it as JPEG for verification."""
+    with Image.open(io.BytesIO(img_bytes)) as im:
+        im.thumbnail((VERIFY_MAX_EDGE, VERIFY_MAX_EDGE), Image.Resampling.LANCZOS)
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+        buffer = io.BytesIO()
+        im.save(buffer, format="JPEG", quality=85)
+
+    return types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
@@ -0,0 +1,148 @@
+"""
+In-memory job state with coalesced background persistence.
+
+The frontend polls status.json and manifest.json, so both are kept as
+complete JSON documents. Updates mutate in-memory dicts; a background task
+flushes them at most every FLUSH_INTERVAL seconds, writing each file to a
+temporary sibling and swapping it in with os.replace so readers never see
+a partial file. Background flushes serialize on the event loop and write
+from a worker thread, so disk I/O doesn't stall in-flight API calls.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import json_utils
+
+FLUSH_INTERVAL = 0.25
+
+_MISSING = object()
+
+
+class JobStore:
+    """Holds a job's status and manifest and persists them in the background."""
+
+    def __init__(self, job_id: str, output_dir: str, flush_interval: float = FLUSH_INTERVAL):
+        self.job_id = job_id
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.status_path = self.output_dir / "status.json"
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.flush_interval = flush_interval
+
+        # Seed from disk once; the frontend writes the initial status
+        self.status: Dict[str, Any] = self._load(self.status_path) or {}
+        self.manifest: Optional[Dict[str, Any]] = self._load(self.manifest_path)
+
+        self._dirty = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._pending_write: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _load(path: Path) -> Optional[Dict[str, Any]]:
+        if not path.exists():
+            return None
+        return json_utils.loads(path.read_bytes())
+
+    @staticmethod
+    def _write(path: Path, payload: bytes):
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def _snapshot(self) -> List[Tuple[Path, bytes]]:
+        """Serialize pending state; must run on the event loop so no update interleaves."""
+        self._dirty.clear()
+        writes = []
+        if self.manifest is not None:
+            writes.append((self.manifest_path, json_utils.dumps(self.manifest)))
+        writes.append((self.status_path, json_utils.dumps(self.status)))
+        return writes
+
+    @classmethod
+    def _write_all(cls, writes: List[Tuple[Path, bytes]]):
+        for path, payload in writes:
+            cls._write(path, payload)
+
+    def start(self):
+        """Start the background writer; must be called from a running event loop."""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def __aenter__(self) -> "JobStore":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def update_status(self, status_data: Dict[str, Any]):
+        """Merge fields into the job status; a repeat of the current values is a no-op."""
+        if all(self.status.get(key, _MISSING) == value for key, value in status_data.items()):
+            return
+
+        self.status.update(status_data)
+        self.status["updated_at"] = datetime.now().isoformat()
+        self._dirty.set()
+
+    def set_manifest(self, manifest: Dict[str, Any]):
+        """Replace the whole manifest, e.g. when a job starts."""
+        self.manifest = manifest
+        self._dirty.set()
+
+    def add_image(self, image_data: Dict[str, Any]):
+        """Append an image to the manifest and mirror the list into the status."""
+        if self.manifest is None:
+            self.manifest = {"images": [], "job_id": self.job_id, "created_at": datetime.now().isoformat()}
+
+        self.manifest["images"].append(image_data)
+        # Entries are stamped when they're built, so reuse that time
+        self.manifest["updated_at"] = image_data.get("created_at") or datetime.now().isoformat()
+        self.status["images"] = self.manifest["images"]
+        self._dirty.set()
+
+    def replace_image(self, variation_type: str, image_data: Dict[str, Any]):
+        """Swap in a regenerated image for the entry of the same variation, keeping its id."""
+        images = self.manifest["images"]
+        for i, img in enumerate(images):
+            if img.get("variationType") == variation_type:
+                image_data["id"] = img["id"]
+                images[i] = image_data
+                break
+
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        self.status["images"] = images
+        self._dirty.set()
+
+    def flush(self):
+        """Write status and manifest to disk now."""
+        self._write_all(self._snapshot())
+
+    async def _flush_loop(self):
+        while True:
+            await self._dirty.wait()
+            # Coalesce bursts of updates into a single write
+            await asyncio.sleep(self.flush_interval)
+            self._pending_write = asyncio.create_task(
+                asyncio.to_thread(self._write_all, self._snapshot())
+            )
+            # Shielded so close() can cancel the loop without abandoning a write mid-file
+            await asyncio.shield(self._pending_write)
+
+    async def close(self):
+        """Stop the background writer and persist any pending changes."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._pending_write is not None:
+            await self._pending_write
+            self._pending_write = None
+        if self._dirty.is_set():
+            self.flush()
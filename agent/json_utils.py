@@ -0,0 +1,79 @@
+"""
+Helpers for encoding job files and decoding JSON returned by Gemini calls.
+
+orjson is used when installed; the stdlib json module is the fallback.
+"""
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_FENCED_JSON = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+_decoder = json.JSONDecoder()
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialise obj to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strip_json_fences(text: str) -> str:
+    """Remove a surrounding ```json ... ``` markdown fence, if present."""
+    text = text.strip()
+    match = _FENCED_JSON.match(text)
+    if match:
+        return match.group(1)
+    # Unterminated or partial fence
+    return text.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+
+
+def parse_json_response(text: str) -> Any:
+    """
+    Decode a model response as JSON.
+
+    Tries the (fence-stripped) text as-is first, then falls back to the first
+    complete {...} object embedded in surrounding prose. Raises ValueError
+    carrying the raw text when neither works.
+    """
+    cleaned = strip_json_fences(text)
+    try:
+        return loads(cleaned)
+    except ValueError:
+        pass
+
+    start = cleaned.find("{")
+    while start != -1:
+        try:
+            obj, _ = _decoder.raw_decode(cleaned, start)
+            return obj
+        except ValueError:
+            start = cleaned.find("{", start + 1)
+
+    raise ValueError(f"No JSON object in model response: {text[:500]!r}")
+
+
+def parse_response(response: Any) -> Any:
+    """
+    Return the JSON payload of a Gemini response.
+
+    Uses the SDK-decoded response.parsed when a response_schema was set,
+    otherwise decodes response.text with parse_json_response.
+    """
+    parsed = getattr(response, "parsed", None)
+    if parsed is not None:
+        return parsed
+    return parse_json_response(response.text)
@@ -0,0 +1,48 @@
+"""
+On-disk cache of parsed user prompts.
+
+Parsing a prompt costs a Gemini text call, and the same prompt recurs across
+retries, regenerations and test runs. Results are keyed by the sha256 of the
+normalised prompt (lowercased, whitespace collapsed) and written atomically
+with os.replace. Set PROMPT_CACHE_DISABLE=1 to always call the model.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+import json_utils
+
+CACHE_DIR = Path(os.getenv("PROMPT_CACHE_DIR", Path.home() / ".cache" / "sqm" / "prompts"))
+CACHE_DISABLED = os.getenv("PROMPT_CACHE_DISABLE", "0") == "1"
+
+
+def _cache_path(prompt: str) -> Path:
+    normalised = " ".join(prompt.lower().split())
+    return CACHE_DIR / f"{hashlib.sha256(normalised.encode()).hexdigest()}.json"
+
+
+def get_cached_parse(prompt: str) -> Optional[Dict[str, Any]]:
+    """Return the cached parse for a prompt, or None on a miss."""
+    if CACHE_DISABLED:
+        return None
+    try:
+        return json_utils.loads(_cache_path(prompt).read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def cache_parse(prompt: str, parsed: Dict[str, Any]):
+    """Store a successful parse. Cache write failures are ignored."""
+    if CACHE_DISABLED:
+        return
+    path = _cache_path(prompt)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(json_utils.dumps(parsed))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Prompt cache write failed: {e}")
+        tmp_path.unlink(missing_ok=True)
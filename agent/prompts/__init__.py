@@ -3,6 +3,11 @@ Prompts package for SQM Project Images Generator.
 
 Contains all prompt templates, suburb data, and shot type definitions
 for generating photorealistic architectural images.
+
+Everything here is string and dict work that is either precomputed at
+import or memoized, so it is not a candidate for JIT compilation: Numba
+only supports a small subset of string operations and would fall back
+to object mode, which is slower than plain Python.
 """
 
 from .melbourne_suburbs import (
@@ -12,6 +17,7 @@ from .melbourne_suburbs import (
 )
 
 from .shot_types import (
+    ShotType,
     SHOT_TYPES,
     SHOT_CATEGORIES,
     MULTI_UNIT_EXTRA_SHOTS,
@@ -20,18 +26,22 @@ from .shot_types import (
     get_hero_shot,
     get_all_shots_ordered,
     get_category_info,
-    get_shots_for_project_type
+    get_shots_for_project_type,
+    is_multi_unit_project
 )
 
 from .photorealistic import (
     PHOTOREALISTIC_BASE,
+    PHOTOREALISTIC_PROMPTS,
     PROJECT_TYPE_PROMPTS,
     LIGHTING_CONDITIONS,
     build_photorealistic_prompt,
-    get_lighting_for_shot
+    get_lighting_for_shot,
+    get_prompt_for_shot
 )
 
 from .style_transfer import (
+    STYLE_ANALYSIS_PROMPT,
     build_style_analysis_prompt,
     build_style_transfer_hero_prompt,
     build_regeneration_prompt_with_feedback
@@ -43,6 +53,7 @@ __all__ = [
     "get_suburb_context",
     "build_suburb_context_prompt",
     # Shot types
+    "ShotType",
     "SHOT_TYPES",
     "SHOT_CATEGORIES",
     "MULTI_UNIT_EXTRA_SHOTS",
@@ -52,13 +63,17 @@ __all__ = [
     "get_all_shots_ordered",
     "get_category_info",
     "get_shots_for_project_type",
+    "is_multi_unit_project",
     # Photorealistic
     "PHOTOREALISTIC_BASE",
+    "PHOTOREALISTIC_PROMPTS",
     "PROJECT_TYPE_PROMPTS",
     "LIGHTING_CONDITIONS",
     "build_photorealistic_prompt",
     "get_lighting_for_shot",
+    "get_prompt_for_shot",
     # Style transfer
+    "STYLE_ANALYSIS_PROMPT",
     "build_style_analysis_prompt",
     "build_style_transfer_hero_prompt",
     "build_regeneration_prompt_with_feedback",
@@ -5,6 +5,9 @@ Provides suburb-specific visual context for generating photorealistic
 architectural images that look appropriate for each Melbourne location.
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 MELBOURNE_SUBURBS = {
     # Eastern Suburbs (SQM's Primary Market)
     "balwyn": {
@@ -308,35 +311,36 @@ MELBOURNE_SUBURBS = {
 }
 
 
-def get_suburb_context(suburb_name: str) -> dict:
-    """
-    Get the context for a Melbourne suburb.
-    Returns default context if suburb not found.
-    """
-    # Normalize suburb name
-    normalized = suburb_name.lower().strip().replace(" ", "_").replace("-", "_")
+# Read-only views so callers can't mutate the shared suburb data
+_SUBURB_INDEX = {name: MappingProxyType(context) for name, context in MELBOURNE_SUBURBS.items()}
 
-    if normalized in MELBOURNE_SUBURBS:
-        return MELBOURNE_SUBURBS[normalized]
+# Context for unknown suburbs
+_DEFAULT_CONTEXT = MappingProxyType({
+    "style": "contemporary suburban",
+    "trees": "mix of native and exotic trees",
+    "streets": "typical suburban streets",
+    "neighbours": "mixed housing types",
+    "finish_level": "mid-range",
+    "typical_lots": "500-700sqm",
+    "character": "Melbourne suburban area"
+})
 
-    # Return default context for unknown suburbs
-    return {
-        "style": "contemporary suburban",
-        "trees": "mix of native and exotic trees",
-        "streets": "typical suburban streets",
-        "neighbours": "mixed housing types",
-        "finish_level": "mid-range",
-        "typical_lots": "500-700sqm",
-        "character": "Melbourne suburban area"
-    }
+# Spaces and hyphens both become underscores in suburb keys
+_NORMALIZE = str.maketrans({" ": "_", "-": "_"})
 
 
-def build_suburb_context_prompt(suburb_name: str) -> str:
+@lru_cache(maxsize=128)
+def get_suburb_context(suburb_name: str) -> MappingProxyType:
     """
-    Build a prompt section describing the suburb context for image generation.
+    Get the (read-only) context for a Melbourne suburb.
+    Returns default context if suburb not found.
     """
-    context = get_suburb_context(suburb_name)
+    # Normalize suburb name
+    normalized = suburb_name.lower().strip().translate(_NORMALIZE)
+    return _SUBURB_INDEX.get(normalized, _DEFAULT_CONTEXT)
+
 
+def _render_context_prompt(suburb_name: str, context) -> str:
     return f"""
 MELBOURNE SUBURB CONTEXT - {suburb_name.replace('_', ' ').title()}:
 
@@ -351,3 +355,21 @@ Typical Lot Sizes: {context['typical_lots']}
 The generated images must reflect this specific Melbourne suburb's character.
 Include appropriate vegetation, neighbouring property styles, and finish levels.
 """
+
+
+# Known suburbs are rendered once at import, titled from their canonical key
+_PRECOMPUTED_PROMPTS = {
+    name: _render_context_prompt(name, context) for name, context in _SUBURB_INDEX.items()
+}
+
+
+@lru_cache(maxsize=128)
+def build_suburb_context_prompt(suburb_name: str) -> str:
+    """
+    Build a prompt section describing the suburb context for image generation.
+    """
+    normalized = suburb_name.lower().strip().translate(_NORMALIZE)
+    prompt = _PRECOMPUTED_PROMPTS.get(normalized)
+    if prompt is None:
+        prompt = _render_context_prompt(suburb_name, _DEFAULT_CONTEXT)
+    return prompt
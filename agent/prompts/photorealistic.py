@@ -5,6 +5,9 @@ Defines the strict requirements for generating photorealistic architectural imag
 that match professional real estate photography standards (realestate.com.au quality).
 """
 
+from functools import lru_cache
+from types import MappingProxyType
+
 # Base photorealistic requirements applied to ALL generated images
 PHOTOREALISTIC_BASE = """
 PHOTOREALISTIC MANDATORY REQUIREMENTS:
@@ -64,7 +67,7 @@ TECHNICAL PHOTOGRAPHY:
 """
 
 # Project type specific additions
-PROJECT_TYPE_PROMPTS = {
+PROJECT_TYPE_PROMPTS = MappingProxyType({
     "dual_occupancy": """
 PROJECT TYPE: Dual Occupancy Development
 
@@ -120,10 +123,10 @@ DESIGN LANGUAGE:
 - Private and common outdoor spaces
 - Entry lobby as architectural feature
 """
-}
+})
 
 # Lighting condition prompts
-LIGHTING_CONDITIONS = {
+LIGHTING_CONDITIONS = MappingProxyType({
     "daylight_soft": """
 LIGHTING CONDITION: Soft Daylight
 
@@ -183,9 +186,30 @@ LIGHTING CONDITION: Interior Styled/Editorial
 - Magazine/editorial quality lighting
 - Highlights and shadows for depth
 """
+})
+
+
+# Base requirements plus each project type's section
+_BASE_BY_PROJECT = {
+    project_type: PHOTOREALISTIC_BASE + "\n" + text
+    for project_type, text in PROJECT_TYPE_PROMPTS.items()
 }
 
 
+def _join_prompt(project_type: str, lighting: str) -> str:
+    base = _BASE_BY_PROJECT.get(project_type, PHOTOREALISTIC_BASE)
+    light = LIGHTING_CONDITIONS.get(lighting)
+    return base + "\n" + light if light else base
+
+
+# Every known (project_type, lighting) combination, rendered once at import
+PHOTOREALISTIC_PROMPTS = MappingProxyType({
+    (project_type, lighting): _join_prompt(project_type, lighting)
+    for project_type in PROJECT_TYPE_PROMPTS
+    for lighting in LIGHTING_CONDITIONS
+})
+
+
 def build_photorealistic_prompt(
     project_type: str = "dual_occupancy",
     lighting: str = "daylight_soft"
@@ -200,51 +224,57 @@ def build_photorealistic_prompt(
     Returns:
         Complete prompt string with all photorealistic requirements
     """
-    parts = [PHOTOREALISTIC_BASE]
-
-    if project_type in PROJECT_TYPE_PROMPTS:
-        parts.append(PROJECT_TYPE_PROMPTS[project_type])
-
-    if lighting in LIGHTING_CONDITIONS:
-        parts.append(LIGHTING_CONDITIONS[lighting])
-
-    return "\n".join(parts)
+    prompt = PHOTOREALISTIC_PROMPTS.get((project_type, lighting))
+    if prompt is None:
+        # Unknown project types or lightings add nothing to the base
+        prompt = _join_prompt(project_type, lighting)
+    return prompt
+
+
+# Lighting condition per shot type
+_LIGHTING_BY_SHOT = MappingProxyType({
+    # Hero shots
+    "hero_facade": "daylight_soft",
+    "hero_twilight": "blue_hour",
+    "hero_elevated": "daylight_sunny",
+
+    # Site context
+    "context_street": "daylight_soft",
+    "context_aerial": "daylight_sunny",
+    "context_approach": "daylight_soft",
+
+    # Architectural features
+    "feature_entry": "daylight_soft",
+    "feature_material": "daylight_sunny",  # Sunlight shows texture
+    "feature_signature": "golden_hour",  # Dramatic
+
+    # Interior spaces
+    "interior_living": "interior_daylight",
+    "interior_kitchen": "interior_styled",
+    "interior_master": "interior_daylight",
+    "interior_bathroom": "interior_styled",
+
+    # Spatial experience
+    "spatial_staircase": "interior_daylight",
+    "spatial_window": "daylight_sunny",  # Light streaming
+    "spatial_volume": "interior_daylight",
+
+    # Lifestyle
+    "lifestyle_morning": "golden_hour",  # Morning version
+    "lifestyle_evening": "blue_hour"
+})
 
 
 def get_lighting_for_shot(shot_id: str) -> str:
     """
     Get appropriate lighting condition for a specific shot type.
     """
-    lighting_mapping = {
-        # Hero shots
-        "hero_facade": "daylight_soft",
-        "hero_twilight": "blue_hour",
-        "hero_elevated": "daylight_sunny",
-
-        # Site context
-        "context_street": "daylight_soft",
-        "context_aerial": "daylight_sunny",
-        "context_approach": "daylight_soft",
-
-        # Architectural features
-        "feature_entry": "daylight_soft",
-        "feature_material": "daylight_sunny",  # Sunlight shows texture
-        "feature_signature": "golden_hour",  # Dramatic
-
-        # Interior spaces
-        "interior_living": "interior_daylight",
-        "interior_kitchen": "interior_styled",
-        "interior_master": "interior_daylight",
-        "interior_bathroom": "interior_styled",
-
-        # Spatial experience
-        "spatial_staircase": "interior_daylight",
-        "spatial_window": "daylight_sunny",  # Light streaming
-        "spatial_volume": "interior_daylight",
-
-        # Lifestyle
-        "lifestyle_morning": "golden_hour",  # Morning version
-        "lifestyle_evening": "blue_hour"
-    }
-
-    return lighting_mapping.get(shot_id, "daylight_soft")
+    return _LIGHTING_BY_SHOT.get(shot_id, "daylight_soft")
+
+
+@lru_cache(maxsize=512)
+def get_prompt_for_shot(shot_id: str, project_type: str = "dual_occupancy") -> str:
+    """
+    Get the complete photorealistic requirements for a shot, lit as that shot calls for.
+    """
+    return build_photorealistic_prompt(project_type, get_lighting_for_shot(shot_id))
@@ -5,9 +5,13 @@ Defines the 18 standard shots that make up a complete project showcase,
 organized into 6 categories following professional architectural photography principles.
 """
 
-from typing import List, Dict, Any
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Tuple
 
-SHOT_CATEGORIES = {
+# Read-only, as are the per-category entries
+SHOT_CATEGORIES = MappingProxyType({name: MappingProxyType(info) for name, info in {
     "hero_shots": {
         "name": "Hero Shots",
         "description": "The money shots - website banners, brochure covers, planning submissions",
@@ -38,19 +42,36 @@ SHOT_CATEGORIES = {
         "description": "Emotional connection - help buyers imagine their life in this home",
         "count": 2
     }
-}
-
-SHOT_TYPES: List[Dict[str, Any]] = [
+}.items()})
+
+
+@dataclass(frozen=True, slots=True)
+class ShotType:
+    """A single shot in the showcase package. Immutable, so shots can be shared freely."""
+    id: str
+    category: str
+    name: str
+    order: int
+    prompt: str
+    aspect_ratio: str
+    is_hero: bool = False
+    # Interior shots are verified for style and finish, not building shape
+    is_interior: bool = False
+    # Shots framed like the hero, so resembling it is expected, not an echo
+    same_framing: bool = False
+
+
+SHOT_TYPES: Tuple[ShotType, ...] = (
     # ============================================
     # HERO SHOTS (3 images)
     # ============================================
-    {
-        "id": "hero_facade",
-        "category": "hero_shots",
-        "name": "Primary Facade",
-        "order": 1,
-        "is_hero": True,
-        "prompt": """
+    ShotType(
+        id="hero_facade",
+        category="hero_shots",
+        name="Primary Facade",
+        order=1,
+        is_hero=True,
+        prompt="""
 SHOT TYPE: Primary Facade (Hero Shot)
 
 CAMERA SETUP:
@@ -76,15 +97,16 @@ REQUIREMENTS:
 - Premium real estate photography quality
 - Professional architectural firm presentation standard
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "hero_twilight",
-        "category": "hero_shots",
-        "name": "Twilight Hero",
-        "order": 2,
-        "is_hero": True,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="hero_twilight",
+        category="hero_shots",
+        name="Twilight Hero",
+        order=2,
+        is_hero=True,
+        same_framing=True,
+        prompt="""
 SHOT TYPE: Twilight Hero Shot
 
 CAMERA SETUP:
@@ -110,15 +132,15 @@ MOOD:
 - Inviting, aspirational
 - Showcases how the home looks lived-in at night
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "hero_elevated",
-        "category": "hero_shots",
-        "name": "Elevated 3/4 Angle",
-        "order": 3,
-        "is_hero": True,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="hero_elevated",
+        category="hero_shots",
+        name="Elevated 3/4 Angle",
+        order=3,
+        is_hero=True,
+        prompt="""
 SHOT TYPE: Elevated 3/4 Angle (Drone Perspective)
 
 CAMERA SETUP:
@@ -141,18 +163,18 @@ REVEALS:
 - Outdoor living areas and courtyards
 - Garden design and landscaping
 """,
-        "aspect_ratio": "16:9"
-    },
+        aspect_ratio="16:9"
+    ),
 
     # ============================================
     # SITE & CONTEXT (3 images)
     # ============================================
-    {
-        "id": "context_street",
-        "category": "site_context",
-        "name": "Street Scene",
-        "order": 4,
-        "prompt": """
+    ShotType(
+        id="context_street",
+        category="site_context",
+        name="Street Scene",
+        order=4,
+        prompt="""
 SHOT TYPE: Street Scene Context
 
 CAMERA SETUP:
@@ -173,14 +195,14 @@ PURPOSE - PLANNING PERMIT JUSTIFICATION:
 - Quality contribution to street character
 - Setback alignment with neighbours
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "context_aerial",
-        "category": "site_context",
-        "name": "Aerial/Drone View",
-        "order": 5,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="context_aerial",
+        category="site_context",
+        name="Aerial/Drone View",
+        order=5,
+        prompt="""
 SHOT TYPE: Aerial Site View
 
 CAMERA SETUP:
@@ -203,14 +225,14 @@ DEMONSTRATES:
 - Vehicle access and parking
 - Relationship to neighbours
 """,
-        "aspect_ratio": "4:3"
-    },
-    {
-        "id": "context_approach",
-        "category": "site_context",
-        "name": "Pedestrian Approach",
-        "order": 6,
-        "prompt": """
+        aspect_ratio="4:3"
+    ),
+    ShotType(
+        id="context_approach",
+        category="site_context",
+        name="Pedestrian Approach",
+        order=6,
+        prompt="""
 SHOT TYPE: Pedestrian Approach
 
 CAMERA SETUP:
@@ -232,18 +254,18 @@ EXPERIENCE CAPTURED:
 - Quality of entry design
 - Landscaping first impressions
 """,
-        "aspect_ratio": "4:3"
-    },
+        aspect_ratio="4:3"
+    ),
 
     # ============================================
     # ARCHITECTURAL FEATURES (3 images)
     # ============================================
-    {
-        "id": "feature_entry",
-        "category": "architectural_features",
-        "name": "Entry Threshold",
-        "order": 7,
-        "prompt": """
+    ShotType(
+        id="feature_entry",
+        category="architectural_features",
+        name="Entry Threshold",
+        order=7,
+        prompt="""
 SHOT TYPE: Entry Threshold Detail
 
 CAMERA SETUP:
@@ -265,14 +287,14 @@ DESIGN INTENT:
 - Material quality at touch points
 - Architectural character introduction
 """,
-        "aspect_ratio": "4:3"
-    },
-    {
-        "id": "feature_material",
-        "category": "architectural_features",
-        "name": "Material Detail",
-        "order": 8,
-        "prompt": """
+        aspect_ratio="4:3"
+    ),
+    ShotType(
+        id="feature_material",
+        category="architectural_features",
+        name="Material Detail",
+        order=8,
+        prompt="""
 SHOT TYPE: Material Detail Close-up
 
 CAMERA SETUP:
@@ -292,14 +314,14 @@ SHOWCASES:
 - Brick pattern, timber species, render finish
 - How materials age and weather
 """,
-        "aspect_ratio": "1:1"
-    },
-    {
-        "id": "feature_signature",
-        "category": "architectural_features",
-        "name": "Signature Element",
-        "order": 9,
-        "prompt": """
+        aspect_ratio="1:1"
+    ),
+    ShotType(
+        id="feature_signature",
+        category="architectural_features",
+        name="Signature Element",
+        order=9,
+        prompt="""
 SHOT TYPE: Signature Architectural Element
 
 CAMERA SETUP:
@@ -319,18 +341,19 @@ CAPTURES:
 - The architect's signature move
 - Instagram-worthy detail shot
 """,
-        "aspect_ratio": "4:3"
-    },
+        aspect_ratio="4:3"
+    ),
 
     # ============================================
     # KEY INTERIOR SPACES (4 images)
     # ============================================
-    {
-        "id": "interior_living",
-        "category": "interior_spaces",
-        "name": "Living to Outdoor",
-        "order": 10,
-        "prompt": """
+    ShotType(
+        id="interior_living",
+        category="interior_spaces",
+        name="Living to Outdoor",
+        order=10,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Living Room to Outdoor Connection
 
 CAMERA SETUP:
@@ -352,14 +375,15 @@ DEMONSTRATES:
 - Connection to garden
 - Melbourne lifestyle living
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "interior_kitchen",
-        "category": "interior_spaces",
-        "name": "Kitchen",
-        "order": 11,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="interior_kitchen",
+        category="interior_spaces",
+        name="Kitchen",
+        order=11,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Kitchen Feature Shot
 
 CAMERA SETUP:
@@ -381,14 +405,15 @@ BUYER PRIORITIES:
 - Appliance space and integration
 - Work triangle efficiency
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "interior_master",
-        "category": "interior_spaces",
-        "name": "Master Suite",
-        "order": 12,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="interior_master",
+        category="interior_spaces",
+        name="Master Suite",
+        order=12,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Master Bedroom Suite
 
 CAMERA SETUP:
@@ -409,14 +434,15 @@ CONVEYS:
 - Sense of retreat and privacy
 - Connection to ensuite and WIR
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "interior_bathroom",
-        "category": "interior_spaces",
-        "name": "Bathroom",
-        "order": 13,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="interior_bathroom",
+        category="interior_spaces",
+        name="Bathroom",
+        order=13,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Feature Bathroom
 
 CAMERA SETUP:
@@ -437,18 +463,19 @@ FINISH QUALITY INDICATORS:
 - Stone or quality vanity top
 - Sense of luxury and spa-like retreat
 """,
-        "aspect_ratio": "4:3"
-    },
+        aspect_ratio="4:3"
+    ),
 
     # ============================================
     # SPATIAL EXPERIENCE (3 images)
     # ============================================
-    {
-        "id": "spatial_staircase",
-        "category": "spatial_experience",
-        "name": "Staircase Void",
-        "order": 14,
-        "prompt": """
+    ShotType(
+        id="spatial_staircase",
+        category="spatial_experience",
+        name="Staircase Void",
+        order=14,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Staircase and Void
 
 CAMERA SETUP:
@@ -469,14 +496,15 @@ ARCHITECTURAL QUALITY:
 - Circulation as feature
 - Material quality (timber, steel, glass)
 """,
-        "aspect_ratio": "3:4"
-    },
-    {
-        "id": "spatial_window",
-        "category": "spatial_experience",
-        "name": "Window Moment",
-        "order": 15,
-        "prompt": """
+        aspect_ratio="3:4"
+    ),
+    ShotType(
+        id="spatial_window",
+        category="spatial_experience",
+        name="Window Moment",
+        order=15,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Window Moment / Light Quality
 
 CAMERA SETUP:
@@ -497,14 +525,15 @@ CAPTURES:
 - Connection to outdoors
 - Architectural framing of nature
 """,
-        "aspect_ratio": "4:3"
-    },
-    {
-        "id": "spatial_volume",
-        "category": "spatial_experience",
-        "name": "Volume Shot",
-        "order": 16,
-        "prompt": """
+        aspect_ratio="4:3"
+    ),
+    ShotType(
+        id="spatial_volume",
+        category="spatial_experience",
+        name="Volume Shot",
+        order=16,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Double Height / Volume Space
 
 CAMERA SETUP:
@@ -525,18 +554,19 @@ WOW FACTOR:
 - Sense of volume and air
 - Premium space feeling
 """,
-        "aspect_ratio": "3:4"
-    },
+        aspect_ratio="3:4"
+    ),
 
     # ============================================
     # LIFESTYLE & ATMOSPHERE (2 images)
     # ============================================
-    {
-        "id": "lifestyle_morning",
-        "category": "lifestyle_atmosphere",
-        "name": "Morning Light",
-        "order": 17,
-        "prompt": """
+    ShotType(
+        id="lifestyle_morning",
+        category="lifestyle_atmosphere",
+        name="Morning Light",
+        order=17,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Morning Light Scene
 
 CAMERA SETUP:
@@ -557,14 +587,15 @@ EMOTIONAL APPEAL:
 - Eastern orientation benefits
 - Daily ritual moments
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "lifestyle_evening",
-        "category": "lifestyle_atmosphere",
-        "name": "Evening Entertaining",
-        "order": 18,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="lifestyle_evening",
+        category="lifestyle_atmosphere",
+        name="Evening Entertaining",
+        order=18,
+        is_interior=True,
+        prompt="""
 SHOT TYPE: Evening Entertaining / Alfresco
 
 CAMERA SETUP:
@@ -586,38 +617,50 @@ MELBOURNE LIFESTYLE:
 - Evening gatherings
 - Aspirational social life
 """,
-        "aspect_ratio": "16:9"
-    }
-]
+        aspect_ratio="16:9"
+    )
+)
+
 
+# Lookup indexes over SHOT_TYPES, built once
+_SHOT_BY_ID: Dict[str, ShotType] = {shot.id: shot for shot in SHOT_TYPES}
 
-def get_shot_by_id(shot_id: str) -> Dict[str, Any] | None:
+_SHOTS_BY_CATEGORY: Dict[str, List[ShotType]] = defaultdict(list)
+for _shot in SHOT_TYPES:
+    _SHOTS_BY_CATEGORY[_shot.category].append(_shot)
+_SHOTS_BY_CATEGORY = dict(_SHOTS_BY_CATEGORY)
+
+_HERO_SHOT: ShotType = next(
+    (shot for shot in SHOT_TYPES if shot.is_hero and shot.order == 1),
+    SHOT_TYPES[0]
+)
+
+
+def get_shot_by_id(shot_id: str) -> ShotType | None:
     """Get a specific shot definition by ID."""
-    for shot in SHOT_TYPES:
-        if shot["id"] == shot_id:
-            return shot
-    return None
+    return _SHOT_BY_ID.get(shot_id)
 
 
-def get_shots_by_category(category: str) -> List[Dict[str, Any]]:
+def get_shots_by_category(category: str) -> List[ShotType]:
     """Get all shots in a specific category."""
-    return [shot for shot in SHOT_TYPES if shot["category"] == category]
+    # A copy, so callers can't reorder the shared index
+    return list(_SHOTS_BY_CATEGORY.get(category, ()))
 
 
-def get_hero_shot() -> Dict[str, Any]:
+def get_hero_shot() -> ShotType:
     """Get the primary hero shot (used to establish the design)."""
-    for shot in SHOT_TYPES:
-        if shot.get("is_hero") and shot["order"] == 1:
-            return shot
-    return SHOT_TYPES[0]
+    return _HERO_SHOT
+
 
+_SHOTS_ORDERED: Tuple[ShotType, ...] = tuple(sorted(SHOT_TYPES, key=lambda x: x.order))
 
-def get_all_shots_ordered() -> List[Dict[str, Any]]:
-    """Get all shots in generation order."""
-    return sorted(SHOT_TYPES, key=lambda x: x["order"])
 
+def get_all_shots_ordered() -> Tuple[ShotType, ...]:
+    """Get all shots in generation order (a shared, read-only tuple)."""
+    return _SHOTS_ORDERED
 
-def get_category_info(category: str) -> Dict[str, Any] | None:
+
+def get_category_info(category: str) -> Mapping[str, Any] | None:
     """Get category metadata."""
     return SHOT_CATEGORIES.get(category)
 
@@ -626,13 +669,13 @@ def get_category_info(category: str) -> Dict[str, Any] | None:
 # MULTI-UNIT EXTRA SHOTS (2 additional images)
 # For townhouses (3+ units) and apartments
 # ============================================
-MULTI_UNIT_EXTRA_SHOTS: List[Dict[str, Any]] = [
-    {
-        "id": "multi_unit_variety",
-        "category": "architectural_features",
-        "name": "Unit Variety",
-        "order": 19,
-        "prompt": """
+MULTI_UNIT_EXTRA_SHOTS: Tuple[ShotType, ...] = (
+    ShotType(
+        id="multi_unit_variety",
+        category="architectural_features",
+        name="Unit Variety",
+        order=19,
+        prompt="""
 SHOT TYPE: Unit Variety / Facade Differentiation
 
 CAMERA SETUP:
@@ -655,14 +698,14 @@ DEMONSTRATES:
 - Quality repeated across all units
 - Townhouse streetscape contribution
 """,
-        "aspect_ratio": "16:9"
-    },
-    {
-        "id": "multi_shared_spaces",
-        "category": "lifestyle_atmosphere",
-        "name": "Shared Spaces",
-        "order": 20,
-        "prompt": """
+        aspect_ratio="16:9"
+    ),
+    ShotType(
+        id="multi_shared_spaces",
+        category="lifestyle_atmosphere",
+        name="Shared Spaces",
+        order=20,
+        prompt="""
 SHOT TYPE: Shared Spaces / Common Areas
 
 CAMERA SETUP:
@@ -694,12 +737,23 @@ DEMONSTRATES:
 - Balance of private and shared
 - Body corporate presentation
 """,
-        "aspect_ratio": "16:9"
-    }
-]
+        aspect_ratio="16:9"
+    )
+)
+
 
+# Shot lists for single- and multi-unit projects, sorted once
+_MULTI_UNIT_SHOTS_ORDERED: Tuple[ShotType, ...] = _SHOTS_ORDERED + tuple(
+    sorted(MULTI_UNIT_EXTRA_SHOTS, key=lambda x: x.order)
+)
 
-def get_shots_for_project_type(project_type: str, num_units: int = 2) -> List[Dict[str, Any]]:
+
+def is_multi_unit_project(project_type: str, num_units: int = 2) -> bool:
+    """Townhouses with 3+ units and apartments count as multi-unit projects."""
+    return project_type == "apartments" or (project_type == "townhouses" and num_units >= 3)
+
+
+def get_shots_for_project_type(project_type: str, num_units: int = 2) -> Tuple[ShotType, ...]:
     """
     Get the appropriate shot list based on project type and unit count.
 
@@ -712,12 +766,10 @@ def get_shots_for_project_type(project_type: str, num_units: int = 2) -> List[Di
         num_units: Number of units (for townhouses)
 
     Returns:
-        List of shots in order, including extras for multi-unit projects
+        Shots in order (a shared, read-only tuple), including extras for multi-unit projects
     """
-    base_shots = get_all_shots_ordered()
-
     # Add extra shots for multi-unit projects
-    if project_type == "apartments" or (project_type == "townhouses" and num_units >= 3):
-        return base_shots + sorted(MULTI_UNIT_EXTRA_SHOTS, key=lambda x: x["order"])
+    if is_multi_unit_project(project_type, num_units):
+        return _MULTI_UNIT_SHOTS_ORDERED
 
-    return base_shots
+    return _SHOTS_ORDERED
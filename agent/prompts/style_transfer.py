@@ -9,12 +9,8 @@ Defines prompts for:
 from typing import Dict, Any
 
 
-def build_style_analysis_prompt() -> str:
-    """
-    Build the prompt for analyzing an inspiration image to extract style elements.
-    This analysis is used to guide the generation of a new building in a similar style.
-    """
-    return """<task>
+# Prompt for analyzing an inspiration image to extract style elements
+STYLE_ANALYSIS_PROMPT = """<task>
 Analyze this architectural photograph as a style reference for generating a new building design.
 You are extracting the visual DNA of this design to inspire a NEW building, not to copy it.
 </task>
@@ -144,6 +140,41 @@ Return a JSON object with all extracted style elements:
 }
 </output_format>"""
 
+# The hero shot and output instructions don't depend on the inspiration or project
+_HERO_SHOT_SPECIFICATION = """<shot_specification>
+<type>Primary Facade - Hero Shot</type>
+<camera>
+- Eye-level perspective from footpath opposite the building
+- 35mm lens equivalent, f/11 aperture for maximum sharpness
+- Perfectly straight vertical lines - absolutely NO keystoning
+- Two-point perspective with building centred in frame
+</camera>
+<composition>
+- Full building visible from ground to roofline
+- 20-30% sky visible at top of frame
+- Front garden, setback, and driveway included
+- Melbourne suburban street context visible
+</composition>
+<lighting>
+- Soft overcast daylight OR morning sun (not harsh midday)
+- Even illumination showing materials and textures
+- Subtle shadows for depth and definition
+</lighting>
+</shot_specification>
+
+<output>
+Generate a single photorealistic exterior photograph of this NEW building design.
+The image should look like professional DSLR photography, not CGI.
+</output>"""
+
+
+def build_style_analysis_prompt() -> str:
+    """
+    Build the prompt for analyzing an inspiration image to extract style elements.
+    This analysis is used to guide the generation of a new building in a similar style.
+    """
+    return STYLE_ANALYSIS_PROMPT
+
 
 def build_style_transfer_hero_prompt(
     style_analysis: Dict[str, Any],
@@ -294,31 +325,7 @@ DO NOT:
 {photorealistic_requirements}
 </photorealistic_requirements>
 
-<shot_specification>
-<type>Primary Facade - Hero Shot</type>
-<camera>
-- Eye-level perspective from footpath opposite the building
-- 35mm lens equivalent, f/11 aperture for maximum sharpness
-- Perfectly straight vertical lines - absolutely NO keystoning
-- Two-point perspective with building centred in frame
-</camera>
-<composition>
-- Full building visible from ground to roofline
-- 20-30% sky visible at top of frame
-- Front garden, setback, and driveway included
-- Melbourne suburban street context visible
-</composition>
-<lighting>
-- Soft overcast daylight OR morning sun (not harsh midday)
-- Even illumination showing materials and textures
-- Subtle shadows for depth and definition
-</lighting>
-</shot_specification>
-
-<output>
-Generate a single photorealistic exterior photograph of this NEW building design.
-The image should look like professional DSLR photography, not CGI.
-</output>"""
+{_HERO_SHOT_SPECIFICATION}"""
 
     return prompt
 
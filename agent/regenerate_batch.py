@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Batch Image Regeneration Script
+
+Regenerates several images of an existing job in one process. The manifest,
+hero image and hero description are loaded once, and every shot's attempts
+run concurrently under one concurrency limit.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from prompts import get_shot_by_id
+from regenerate_single import BatchRegenerator, RegenerationError
+from sqm_logging import configure_logging, logger
+import event_loop
+
+
+async def main(
+    job_id: str,
+    variation_types: List[str],
+    output_dir: str,
+    batch_verify: bool = False,
+    draft: bool = False
+):
+    """Regenerate the given shots of a job."""
+    configure_logging(job_id)
+    logger.info(f"Regenerating {', '.join(variation_types)} for job {job_id}")
+
+    unknown = [variation_type for variation_type in variation_types if not get_shot_by_id(variation_type)]
+    if unknown:
+        logger.error(f"ERROR: Unknown shot type: {', '.join(unknown)}")
+        sys.exit(1)
+
+    try:
+        regenerator = BatchRegenerator(job_id, output_dir, batch_verify=batch_verify, draft=draft)
+    except RegenerationError as e:
+        logger.error(f"ERROR: {e}")
+        sys.exit(1)
+
+    # The store's background writer coalesces manifest updates while shots finish
+    async with regenerator.store:
+        saved = await asyncio.gather(*(
+            regenerator.regenerate(variation_type) for variation_type in variation_types
+        ))
+
+    failed = [variation_type for variation_type, ok in zip(variation_types, saved) if not ok]
+    if failed:
+        logger.error(f"ERROR: No image was generated for {', '.join(failed)}")
+        sys.exit(1)
+    logger.info("Regeneration complete!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Regenerate several images from an existing job"
+    )
+    parser.add_argument("job_id", help="Job ID")
+    parser.add_argument("output_dir", help="Output directory path")
+    parser.add_argument(
+        "--shots",
+        required=True,
+        help="Comma-separated shot types to regenerate"
+    )
+    parser.add_argument(
+        "--batch-verify",
+        action="store_true",
+        help="Score each round of exterior candidates in one vision call"
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Try one round from the cheaper draft model once a shot is close to passing"
+    )
+
+    args = parser.parse_args()
+    # Keep order, drop duplicates so a shot isn't regenerated twice at once
+    shots = list(dict.fromkeys(shot.strip() for shot in args.shots.split(",") if shot.strip()))
+    event_loop.run(main(
+        args.job_id,
+        shots,
+        args.output_dir,
+        batch_verify=args.batch_verify,
+        draft=args.draft
+    ))
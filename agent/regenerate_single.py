@@ -7,15 +7,18 @@ Used for fixing low-confidence images without regenerating the entire showcase.
 """
 
 import argparse
+import asyncio
+import contextlib
+import hashlib
+import itertools
 import json
 import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Awaitable
 
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 
 # Load environment variables
@@ -27,122 +30,163 @@ sys.path.insert(0, str(Path(__file__).parent))
 from prompts import (
     build_suburb_context_prompt,
     get_shot_by_id,
-    build_photorealistic_prompt,
-    get_lighting_for_shot,
+    get_prompt_for_shot,
+    ShotType,
 )
+from gemini_client import get_client
+from gemini_retry import retry_transient
+from job_store import JobStore
+from image_utils import EXTENSIONS, MIME_TYPES
+from sqm_logging import configure_logging, logger
+import event_loop
+from json_utils import parse_response
+from verification_schemas import (
+    EXTERIOR_VERIFICATION_SCHEMA,
+    INTERIOR_VERIFICATION_SCHEMA,
+    BATCH_VERIFICATION_SCHEMA,
+)
+
+# Shared Gemini client
+client = get_client()
 
-# Configure Gemini client
-client = genai.Client(api_key=os.getenv("GOOGLE_AI_API_KEY"))
+# Retry rate limits and 5xx before falling back
+_generate_content = retry_transient(client.aio.models.generate_content)
 
 # Configuration
 VERIFICATION_THRESHOLD = int(os.getenv("VERIFICATION_THRESHOLD", "80"))
 MAX_REGEN_ATTEMPTS = int(os.getenv("MAX_REGEN_ATTEMPTS", "3"))
+GENERATION_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "5"))
+# Attempts launched together per round; 1 restores the sequential fixing-prompt loop.
+# Separate from generate_images' CANDIDATES_PER_ROUND, which defaults to 1
+REGEN_CANDIDATES_PER_ROUND = max(1, int(os.getenv("REGEN_CANDIDATES_PER_ROUND", str(MAX_REGEN_ATTEMPTS))))
 
 # Models
 IMAGE_MODEL = "gemini-3-pro-image-preview"
 VISION_MODEL = "gemini-2.0-flash"
+# With --draft, a cheaper model tried for one round once a shot is close to
+# passing; the verifier still has to clear the draft, and later rounds go back
+# to IMAGE_MODEL
+DRAFT_IMAGE_MODEL = os.getenv("DRAFT_IMAGE_MODEL", "gemini-2.5-flash-image")
+DRAFT_MIN_SCORE = int(os.getenv("DRAFT_MIN_SCORE", "60"))
 
-# Interior shot IDs that need different verification criteria
-INTERIOR_SHOT_IDS = [
-    "interior_living",
-    "interior_kitchen",
-    "interior_master",
-    "interior_bathroom",
-    "spatial_staircase",
-    "spatial_window",
-    "spatial_volume",
-    "lifestyle_morning",
-    "lifestyle_evening",
-]
-
+def load_image_as_part(image_path: Path) -> types.Part:
+    """Load an image file and convert to Gemini Part."""
+    image_bytes = image_path.read_bytes()
 
-def is_interior_shot(shot_id: str) -> bool:
-    """Check if a shot type is an interior shot."""
-    return shot_id in INTERIOR_SHOT_IDS
+    mime_type = MIME_TYPES.get(image_path.suffix.lower(), "image/png")
 
+    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
 
-def load_image_as_part(image_path: str) -> types.Part:
-    """Load an image file and convert to Gemini Part."""
-    with open(image_path, "rb") as f:
-        image_bytes = f.read()
-
-    ext = Path(image_path).suffix.lower()
-    mime_types = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-    }
-    mime_type = mime_types.get(ext, "image/png")
 
-    return types.Part.from_bytes(data=image_bytes, mime_type=mime_type)
+# Short fields instead of a paragraph keep the description, which is embedded
+# in every generation prompt, to a few compact lines
+_HERO_FIELDS = (
+    ("silhouette", "Silhouette"),
+    ("storeys", "Storeys"),
+    ("materials", "Materials"),
+    ("window_pattern", "Windows"),
+    ("roof", "Roof"),
+    ("entry", "Entry"),
+    ("style", "Style"),
+    ("distinctive", "Distinctive"),
+)
+_LIST_FIELDS = frozenset({"materials", "distinctive"})
+
+_HERO_DESCRIPTION_CONFIG = types.GenerateContentConfig(
+    response_mime_type="application/json",
+    response_schema=types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            key: types.Schema(type=types.Type.ARRAY, items=types.Schema(type=types.Type.STRING))
+            if key in _LIST_FIELDS else types.Schema(type=types.Type.STRING)
+            for key, _ in _HERO_FIELDS
+        },
+        required=[key for key, _ in _HERO_FIELDS],
+    ),
+    temperature=1.0,
+)
 
 
-def get_aspect_ratio_for_shot(shot_id: str) -> str:
-    """Get the appropriate aspect ratio for each shot type."""
-    landscape_shots = [
-        "hero_facade", "hero_twilight", "hero_elevated",
-        "context_street", "interior_living", "interior_kitchen",
-        "interior_master", "lifestyle_morning", "lifestyle_evening",
-        "multi_unit_variety", "multi_shared_spaces"
-    ]
-    square_shots = ["feature_material"]
-    portrait_shots = ["spatial_staircase", "spatial_volume"]
+def render_hero_description(fields: Dict[str, Any]) -> str:
+    """Render a structured hero description as one 'Label: value' line per field."""
+    lines = []
+    for key, label in _HERO_FIELDS:
+        value = fields.get(key)
+        if isinstance(value, list):
+            value = "; ".join(str(item) for item in value)
+        if value:
+            lines.append(f"{label}: {value}")
+    return "\n".join(lines)
 
-    if shot_id in landscape_shots:
-        return "16:9"
-    elif shot_id in square_shots:
-        return "1:1"
-    elif shot_id in portrait_shots:
-        return "3:4"
-    else:
-        return "4:3"
 
+async def describe_hero_image(hero_part: types.Part, cache_dir: Optional[Path] = None) -> str:
+    """
+    Get a concise structured description of the hero image for consistency.
+
+    With cache_dir, the structured fields are cached as JSON by hero content
+    hash, so a job's hero is described only once. generate_project.py caches
+    its free-text description in separate files. A cache file that doesn't
+    parse to a usable description is ignored and rewritten.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        digest = hashlib.sha256(hero_part.inline_data.data).hexdigest()
+        cache_path = cache_dir / f".hero_description_structured_{digest}.json"
+        try:
+            fields = json.loads(cache_path.read_text())
+            description = render_hero_description(fields) if isinstance(fields, dict) else ""
+            if description:
+                return description
+        except (FileNotFoundError, ValueError):
+            pass
 
-def describe_hero_image(image_path: str) -> str:
-    """Get a detailed description of the hero image for consistency."""
     try:
         prompt = """<task>
-Describe this architectural photograph in precise detail for use as a reference.
+Describe this architectural photograph precisely for use as a reference.
 </task>
 
 <required_details>
-1. Building shape and silhouette
-2. Number of storeys
-3. Facade materials (brick, render, timber, glass)
-4. Window patterns and placements
-5. Roof form and materials
-6. Entry design
-7. Architectural style
-8. Distinctive features
+- silhouette: building shape and massing
+- storeys: number of storeys
+- materials: facade materials with colour and finish (brick, render, timber, glass)
+- window_pattern: window sizes, patterns and placements
+- roof: roof form and materials
+- entry: entry design
+- style: architectural style
+- distinctive: distinctive features
 </required_details>
 
 <output_format>
-Provide a detailed paragraph description.
+Return JSON with exactly these fields. Keep each value to a short phrase.
 </output_format>"""
 
-        image_part = load_image_as_part(image_path)
-
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
-            contents=[image_part, prompt],
-            config=types.GenerateContentConfig(temperature=1.0)
+            contents=[hero_part, prompt],
+            config=_HERO_DESCRIPTION_CONFIG
         )
 
-        return response.text.strip()
+        fields = parse_response(response)
+        description = render_hero_description(fields)
+        if not description:
+            raise ValueError("Empty hero description")
+        if cache_path is not None:
+            tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(fields))
+            os.replace(tmp_path, cache_path)
+        return description
     except Exception as e:
-        print(f"Description error: {e}")
+        logger.warning(f"Description error: {e}")
         return "Modern residential building with quality architectural detailing"
 
 
 def build_variation_prompt(
-    shot: Dict[str, Any],
+    shot: ShotType,
     parsed: Dict[str, Any],
     suburb_context: str,
     hero_description: str
 ) -> str:
     """Build prompt for generating variation based on the hero image."""
-    lighting = get_lighting_for_shot(shot["id"])
 
     prompt = f"""<role>
 You are a professional architectural photographer creating a variation shot of an existing building.
@@ -163,11 +207,11 @@ You are a professional architectural photographer creating a variation shot of a
 </location>
 
 <photorealistic_requirements>
-{build_photorealistic_prompt(parsed.get('project_type', 'dual_occupancy'), lighting)}
+{get_prompt_for_shot(shot.id, parsed.get('project_type', 'dual_occupancy'))}
 </photorealistic_requirements>
 
 <shot_specification>
-{shot['prompt']}
+{shot.prompt}
 </shot_specification>
 
 <consistency_requirements>
@@ -184,46 +228,50 @@ Generate a single photorealistic photograph showing this exact building.
     return prompt
 
 
-def generate_image(
+async def generate_image(
     prompt: str,
-    reference_image_path: Optional[str] = None,
-    aspect_ratio: str = "16:9"
-) -> Optional[bytes]:
-    """Generate an image using Gemini."""
+    reference_part: Optional[types.Part] = None,
+    aspect_ratio: str = "16:9",
+    model: str = IMAGE_MODEL
+) -> Optional[types.Blob]:
+    """Generate an image using Gemini, returned as a Blob so its MIME type travels with the bytes."""
     try:
         contents = []
 
-        if reference_image_path and os.path.exists(reference_image_path):
-            reference_part = load_image_as_part(reference_image_path)
+        if reference_part is not None:
             contents.append(reference_part)
 
         contents.append(prompt)
 
-        response = client.models.generate_content(
-            model=IMAGE_MODEL,
+        # Only IMAGE_MODEL takes an output size; the draft model rejects image_size
+        # and renders at its native size
+        if model == IMAGE_MODEL:
+            image_config = types.ImageConfig(aspect_ratio=aspect_ratio, image_size="2K")
+        else:
+            image_config = types.ImageConfig(aspect_ratio=aspect_ratio)
+
+        response = await _generate_content(
+            model=model,
             contents=contents,
             config=types.GenerateContentConfig(
                 response_modalities=["IMAGE", "TEXT"],
                 temperature=1.0,
-                image_config=types.ImageConfig(
-                    aspect_ratio=aspect_ratio,
-                    image_size="2K"
-                )
+                image_config=image_config
             )
         )
 
         if response.candidates:
             for part in response.candidates[0].content.parts:
                 if part.inline_data and part.inline_data.mime_type.startswith("image/"):
-                    return part.inline_data.data
+                    return part.inline_data
 
         return None
     except Exception as e:
-        print(f"Generation error: {e}")
+        logger.warning(f"Generation error: {e}")
         return None
 
 
-def verify_image(hero_path: str, generated_path: str, shot_type: str) -> Dict:
+async def verify_image(hero_part: types.Part, generated_part: types.Part, shot_type: str) -> Dict:
     """Verify architectural consistency between hero and generated image."""
     try:
         prompt = f"""<task>
@@ -254,33 +302,91 @@ Return ONLY JSON:
 }}
 </output_format>"""
 
-        hero_part = load_image_as_part(hero_path)
-        generated_part = load_image_as_part(generated_path)
-
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
             contents=[hero_part, generated_part, prompt],
             config=types.GenerateContentConfig(
                 response_mime_type="application/json",
+                response_schema=EXTERIOR_VERIFICATION_SCHEMA,
                 temperature=1.0,
             )
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
+        return parse_response(response)
+    except Exception as e:
+        logger.warning(f"Verification error: {e}")
+        return {"total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
+
+
+async def verify_images_batch(
+    hero_part: types.Part,
+    generated_images: List[types.Blob],
+    shot_type: str
+) -> Optional[List[Dict]]:
+    """
+    Verify several candidates of one exterior shot in a single vision call.
+
+    The hero is sent once and the model returns one score object per
+    candidate, in order. Returns None if the call fails or the scores don't
+    line up, so the caller can verify one by one.
+    """
+    try:
+        image_list = "\n".join(
+            f"- Image {n}: Generated variation ({shot_type}), candidate {n - 1}"
+            for n in range(2, len(generated_images) + 2)
+        )
+        prompt = f"""<task>
+Compare each generated architectural image against the reference and score its consistency.
+</task>
 
-        return json.loads(result_text.strip())
+<images>
+- Image 1: Reference hero image
+{image_list}
+</images>
+
+<scoring_criteria>
+Score each generated image 0-20 on:
+1. BUILDING_SHAPE: Does silhouette match?
+2. ARCHITECTURAL_STYLE: Is design language consistent?
+3. MATERIALS_FACADE: Are materials the same?
+4. WINDOWS_OPENINGS: Do patterns match?
+5. PROPORTIONS: Are relationships correct?
+</scoring_criteria>
+
+<output_format>
+Return ONLY JSON with one entry per generated image, in image order:
+{{
+    "scores": [
+        {{"shot_type": "{shot_type}", "total_score": <0-100>, "breakdown": {{...}}, "issues": [...], "suggestions": [...]}}
+    ]
+}}
+</output_format>"""
+
+        generated_parts = [types.Part(inline_data=image) for image in generated_images]
+
+        response = await _generate_content(
+            model=VISION_MODEL,
+            contents=[hero_part, *generated_parts, prompt],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=BATCH_VERIFICATION_SCHEMA,
+                temperature=1.0,
+            )
+        )
+
+        scores = parse_response(response).get("scores", [])
+        if len(scores) != len(generated_images):
+            logger.warning(f"Batch verification returned {len(scores)} scores for {len(generated_images)} images")
+            return None
+        return scores
     except Exception as e:
-        print(f"Verification error: {e}")
-        return {"total_score": 0, "breakdown": {}, "issues": [str(e)]}
+        logger.warning(f"Batch verification error: {e}")
+        return None
 
 
-def verify_interior_image(
-    hero_path: str,
-    generated_path: str,
+async def verify_interior_image(
+    hero_part: types.Part,
+    generated_part: types.Part,
     shot_type: str,
     parsed: Dict[str, Any]
 ) -> Dict:
@@ -328,221 +434,291 @@ Return ONLY JSON:
 }}
 </output_format>"""
 
-        hero_part = load_image_as_part(hero_path)
-        generated_part = load_image_as_part(generated_path)
-
-        response = client.models.generate_content(
+        response = await _generate_content(
             model=VISION_MODEL,
             contents=[hero_part, generated_part, prompt],
             config=types.GenerateContentConfig(
                 response_mime_type="application/json",
+                response_schema=INTERIOR_VERIFICATION_SCHEMA,
                 temperature=1.0,
             )
         )
 
-        result_text = response.text.strip()
-        if result_text.startswith("```"):
-            result_text = result_text.split("```")[1]
-            if result_text.startswith("json"):
-                result_text = result_text[4:]
-
-        return json.loads(result_text.strip())
+        return parse_response(response)
     except Exception as e:
-        print(f"Interior verification error: {e}")
-        return {"total_score": 0, "breakdown": {}, "issues": [str(e)]}
+        logger.warning(f"Interior verification error: {e}")
+        return {"total_score": 0, "breakdown": {}, "issues": [str(e)], "suggestions": []}
 
 
 def build_fixing_prompt(verification_result: Dict) -> str:
     """Build fixing prompt from verification results."""
-    lines = ["<fixes_required>"]
     breakdown = verification_result.get("breakdown", {})
-
-    for criterion, score in breakdown.items():
-        if score < 16:
-            lines.append(f"<fix criterion='{criterion}' score='{score}/20'>Improve this</fix>")
-
-    for issue in verification_result.get("issues", []):
-        lines.append(f"<issue>{issue}</issue>")
-
-    for suggestion in verification_result.get("suggestions", []):
-        lines.append(f"<suggestion>{suggestion}</suggestion>")
-
-    lines.append("</fixes_required>")
-    return "\n".join(lines)
-
-
-def update_manifest(output_dir: str, variation_type: str, new_image_data: Dict):
-    """Update manifest with regenerated image."""
-    manifest_path = Path(output_dir) / "manifest.json"
-
-    with open(manifest_path, "r") as f:
-        manifest = json.load(f)
-
-    # Find and replace the image entry
-    for i, img in enumerate(manifest.get("images", [])):
-        if img.get("variationType") == variation_type:
-            # Preserve the original ID
-            new_image_data["id"] = img["id"]
-            manifest["images"][i] = new_image_data
-            break
-
-    manifest["updated_at"] = datetime.now().isoformat()
-
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
-
-    # Also update status.json
-    status_path = Path(output_dir) / "status.json"
-    if status_path.exists():
-        with open(status_path, "r") as f:
-            status = json.load(f)
-        status["images"] = manifest["images"]
-        with open(status_path, "w") as f:
-            json.dump(status, f, indent=2)
-
-
-def main(job_id: str, variation_type: str, output_dir: str):
-    """Regenerate a single image."""
-    print(f"Regenerating {variation_type} for job {job_id}")
-
-    # Load manifest
-    manifest_path = Path(output_dir) / "manifest.json"
-    if not manifest_path.exists():
-        print("ERROR: Manifest not found")
-        sys.exit(1)
-
-    with open(manifest_path, "r") as f:
-        manifest = json.load(f)
-
-    parsed = manifest.get("parsed", {})
-    suburb = manifest.get("suburb", "balwyn")
-
-    # Get shot definition
-    shot = get_shot_by_id(variation_type)
-    if not shot:
-        print(f"ERROR: Unknown shot type: {variation_type}")
-        sys.exit(1)
-
-    # Find hero image
-    hero_image = None
-    for img in manifest.get("images", []):
-        if img.get("isHero"):
-            hero_image = img
-            break
-
-    if not hero_image:
-        print("ERROR: Hero image not found in manifest")
-        sys.exit(1)
-
-    hero_path = Path(output_dir) / hero_image["filename"]
-    if not hero_path.exists():
-        print(f"ERROR: Hero image file not found: {hero_path}")
-        sys.exit(1)
-
-    # Get suburb context
-    suburb_context = build_suburb_context_prompt(suburb)
-
-    # Get hero description
-    print("Analyzing hero image...")
-    hero_description = describe_hero_image(str(hero_path))
-
-    # Get aspect ratio
-    aspect_ratio = get_aspect_ratio_for_shot(variation_type)
-
-    # Generation loop
-    attempts = 0
-    best_score = 0
-    best_image_data = None
-    best_breakdown = None
-    fixing_prompt = None
-
-    while attempts < MAX_REGEN_ATTEMPTS:
-        attempts += 1
-        print(f"Attempt {attempts}/{MAX_REGEN_ATTEMPTS}")
-
-        # Build prompt
-        variation_prompt = build_variation_prompt(shot, parsed, suburb_context, hero_description)
-
-        if fixing_prompt:
-            variation_prompt += f"\n\n{fixing_prompt}"
-
-        # Generate image
-        image_data = generate_image(
-            variation_prompt,
-            str(hero_path),
-            aspect_ratio=aspect_ratio
-        )
-
-        if not image_data:
-            print("  Failed to generate image")
-            continue
-
-        # Save temporarily for verification
-        temp_path = Path(output_dir) / f"temp_regen_{variation_type}.png"
-        with open(temp_path, "wb") as f:
-            f.write(image_data)
-
-        # Verify
-        print("  Verifying...")
-        if is_interior_shot(variation_type):
-            verification = verify_interior_image(str(hero_path), str(temp_path), variation_type, parsed)
-            print("  [Interior verification - style/quality criteria]")
-        else:
-            verification = verify_image(str(hero_path), str(temp_path), variation_type)
-
-        score = verification.get("total_score", 0)
-        print(f"  Score: {score}/100")
-
-        if score > best_score:
-            best_score = score
-            best_image_data = image_data
-            best_breakdown = verification.get("breakdown", {})
-
-        # Clean up temp
-        temp_path.unlink(missing_ok=True)
-
-        if score > VERIFICATION_THRESHOLD:
-            print(f"  PASSED (>{VERIFICATION_THRESHOLD}%)")
-            break
-        else:
-            print(f"  FAILED, building fixing prompt...")
-            fixing_prompt = build_fixing_prompt(verification)
-
-    # Save best image
-    if best_image_data:
+    return "\n".join(itertools.chain(
+        ("<fixes_required>",),
+        (
+            f"<fix criterion='{criterion}' score='{score}/20'>Improve this</fix>"
+            for criterion, score in breakdown.items()
+            if score < 16
+        ),
+        (f"<issue>{issue}</issue>" for issue in verification_result.get("issues", [])),
+        (f"<suggestion>{suggestion}</suggestion>" for suggestion in verification_result.get("suggestions", [])),
+        ("</fixes_required>",),
+    ))
+
+
+class RegenerationError(Exception):
+    """The job can't be regenerated, e.g. its manifest or hero image is missing."""
+
+
+class BatchRegenerator:
+    """
+    Regenerates shots of one job, doing the job-wide setup once.
+
+    The manifest, hero part, suburb context and hero description are shared
+    by every regenerate() call, as is the concurrency limit, so several
+    shots can be regenerated concurrently in one process.
+
+    With batch_verify, each round of exterior candidates is scored in one
+    vision call once all of them are generated, instead of one call each.
+    With draft, the first round is a single attempt, and a shot whose best
+    score has reached DRAFT_MIN_SCORE gets one round from DRAFT_IMAGE_MODEL
+    before going back to IMAGE_MODEL. Drafts render at the draft model's
+    native size.
+    """
+
+    def __init__(self, job_id: str, output_dir: str, batch_verify: bool = False, draft: bool = False):
+        self.job_id = job_id
+        self.out_dir = Path(output_dir)
+        self.batch_verify = batch_verify
+        self.draft = draft
+
+        # Load manifest
+        self.store = JobStore(job_id, output_dir)
+        manifest = self.store.manifest
+        if manifest is None:
+            raise RegenerationError("Manifest not found")
+
+        self.parsed = manifest.get("parsed", {})
+
+        # Find hero image
+        hero_image = None
+        for img in manifest.get("images", []):
+            if img.get("isHero"):
+                hero_image = img
+                break
+
+        if not hero_image:
+            raise RegenerationError("Hero image not found in manifest")
+
+        hero_path = self.out_dir / hero_image["filename"]
+        if not hero_path.exists():
+            raise RegenerationError(f"Hero image file not found: {hero_path}")
+
+        # Load the hero once; every call below sends the same part
+        self.hero_part = load_image_as_part(hero_path)
+        self.suburb_context = build_suburb_context_prompt(manifest.get("suburb", "balwyn"))
+        self.sem = asyncio.Semaphore(GENERATION_CONCURRENCY)
+        self._hero_description: Optional[asyncio.Future] = None
+
+    def hero_description(self) -> Awaitable[str]:
+        """Describe the hero on first use; concurrent shots share the one call."""
+        if self._hero_description is None:
+            logger.info("Analyzing hero image...")
+            self._hero_description = asyncio.ensure_future(
+                describe_hero_image(self.hero_part, cache_dir=self.out_dir)
+            )
+        return self._hero_description
+
+    async def regenerate(self, variation_type: str) -> bool:
+        """Regenerate one shot and swap it into the manifest. Returns True if an image was saved."""
+        # Get shot definition
+        shot = get_shot_by_id(variation_type)
+        if not shot:
+            raise RegenerationError(f"Unknown shot type: {variation_type}")
+
+        parsed = self.parsed
+        hero_part = self.hero_part
+        sem = self.sem
+        hero_description = await self.hero_description()
+
+        # Get aspect ratio
+        aspect_ratio = shot.aspect_ratio
+        interior = shot.is_interior
+        # Inputs don't change between attempts; retries only append a fixing prompt
+        base_prompt = build_variation_prompt(shot, parsed, self.suburb_context, hero_description)
+
+        async def generate_candidate(attempt_number: int, fixing_prompt: Optional[str], model: str) -> Optional[types.Blob]:
+            logger.info(f"[{variation_type}] Attempt {attempt_number}/{MAX_REGEN_ATTEMPTS} ({model})")
+
+            variation_prompt = base_prompt
+            if fixing_prompt:
+                variation_prompt += f"\n\n{fixing_prompt}"
+
+            async with sem:
+                image = await generate_image(variation_prompt, hero_part, aspect_ratio=aspect_ratio, model=model)
+
+            if not image:
+                logger.info(f"  [{variation_type} {attempt_number}] Failed to generate image")
+            return image
+
+        async def verify_candidate(image: types.Blob) -> Dict:
+            # Verify straight from memory, in the format the model returned
+            generated_part = types.Part(inline_data=image)
+            async with sem:
+                if interior:
+                    return await verify_interior_image(hero_part, generated_part, variation_type, parsed)
+                return await verify_image(hero_part, generated_part, variation_type)
+
+        async def run_attempt(attempt_number: int, fixing_prompt: Optional[str], model: str):
+            """Generate one candidate and verify it as soon as it is ready."""
+            image = await generate_candidate(attempt_number, fixing_prompt, model)
+            if not image:
+                return None, None
+
+            logger.info(f"  [{variation_type} {attempt_number}] Verifying...")
+            return image, await verify_candidate(image)
+
+        async def verified_round(first_attempt: int, round_size: int, fixing_prompt: Optional[str], model: str):
+            """Yield (image, verification) for a round of candidates as verdicts arrive."""
+            if self.batch_verify and not interior and round_size > 1:
+                images = [
+                    image for image in await asyncio.gather(*(
+                        generate_candidate(first_attempt + n, fixing_prompt, model) for n in range(round_size)
+                    ))
+                    if image
+                ]
+                logger.info(f"  [{variation_type}] Verifying {len(images)} candidates...")
+                verifications = None
+                if len(images) > 1:
+                    async with sem:
+                        verifications = await verify_images_batch(hero_part, images, variation_type)
+                if verifications is None:
+                    verifications = await asyncio.gather(*(verify_candidate(image) for image in images))
+                for result in zip(images, verifications):
+                    yield result
+                return
+
+            tasks = [
+                asyncio.create_task(run_attempt(first_attempt + n, fixing_prompt, model))
+                for n in range(round_size)
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # A winner makes the rest of the round redundant
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Generation loop
+        attempts = 0
+        best_score = 0
+        best_image = None
+        best_breakdown = None
+        best_model = None
+        fixing_prompt = None
+        passed = False
+        drafted = False
+        if interior:
+            logger.info(f"  [{variation_type}] Interior verification - style/quality criteria")
+
+        while attempts < MAX_REGEN_ATTEMPTS and not passed:
+            # Launch a round of candidates together and keep the first that passes.
+            # Later rounds wait for the previous verdict so they can use its fixing prompt.
+            round_size = min(REGEN_CANDIDATES_PER_ROUND, MAX_REGEN_ATTEMPTS - attempts)
+            model = IMAGE_MODEL
+            if self.draft and not drafted:
+                if best_score >= DRAFT_MIN_SCORE:
+                    model = DRAFT_IMAGE_MODEL
+                    drafted = True
+                elif attempts == 0 and round_size > 1:
+                    # A single opening attempt scores the shot and leaves the rest for the draft round
+                    round_size = 1
+            results = verified_round(attempts + 1, round_size, fixing_prompt, model)
+            attempts += round_size
+
+            round_best = None
+            async with contextlib.aclosing(results):
+                async for image, verification in results:
+                    if not image:
+                        continue
+
+                    score = verification.get("total_score", 0)
+                    logger.info(f"  [{variation_type}] Score: {score}/100")
+
+                    if score > best_score:
+                        best_score = score
+                        best_image = image
+                        best_breakdown = verification.get("breakdown", {})
+                        best_model = model
+
+                    if round_best is None or score >= round_best.get("total_score", 0):
+                        round_best = verification
+
+                    if score > VERIFICATION_THRESHOLD:
+                        logger.info(f"  [{variation_type}] PASSED (>{VERIFICATION_THRESHOLD}%)")
+                        passed = True
+                        break
+
+            if not passed and round_best is not None:
+                logger.info(f"  [{variation_type}] FAILED, building fixing prompt...")
+                fixing_prompt = build_fixing_prompt(round_best)
+
+        if not best_image:
+            return False
+
+        # Save best image
         low_confidence = best_score <= VERIFICATION_THRESHOLD
         if low_confidence:
-            print(f"Saving as LOW CONFIDENCE (best score: {best_score})")
+            logger.info(f"[{variation_type}] Saving as LOW CONFIDENCE (best score: {best_score})")
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{variation_type}_{timestamp}.png"
-        final_path = Path(output_dir) / filename
-
-        with open(final_path, "wb") as f:
-            f.write(best_image_data)
+        # Name the file after the format the model actually returned
+        filename = f"{variation_type}_{timestamp}{EXTENSIONS.get(best_image.mime_type, '.png')}"
+        final_path = self.out_dir / filename
+        final_path.write_bytes(best_image.data)
 
         # Update manifest
         image_entry = {
             "filename": filename,
-            "url": f"/api/images/{job_id}/{filename}",
+            "url": f"/api/images/{self.job_id}/{filename}",
             "variationType": variation_type,
-            "category": shot["category"],
-            "name": shot["name"],
+            "category": shot.category,
+            "name": shot.name,
             "isHero": False,
             "consistencyScore": best_score,
             "attempts": attempts,
             "lowConfidence": low_confidence,
             "scoreBreakdown": best_breakdown,
             "aspectRatio": aspect_ratio,
+            "imageModel": best_model,
             "regenerated_at": datetime.now().isoformat()
         }
-        update_manifest(output_dir, variation_type, image_entry)
+        # Written by the store's background writer, so other shots keep going
+        self.store.replace_image(variation_type, image_entry)
 
-        print(f"Saved: {filename}")
-        print("Regeneration complete!")
-    else:
-        print("ERROR: No image was generated")
+        logger.info(f"[{variation_type}] Saved: {filename}")
+        return True
+
+
+async def main(job_id: str, variation_type: str, output_dir: str, batch_verify: bool = False, draft: bool = False):
+    """Regenerate a single image."""
+    configure_logging(job_id)
+    logger.info(f"Regenerating {variation_type} for job {job_id}")
+
+    try:
+        regenerator = BatchRegenerator(job_id, output_dir, batch_verify=batch_verify, draft=draft)
+        async with regenerator.store:
+            saved = await regenerator.regenerate(variation_type)
+    except RegenerationError as e:
+        logger.error(f"ERROR: {e}")
+        sys.exit(1)
+
+    if not saved:
+        logger.error("ERROR: No image was generated")
         sys.exit(1)
+    logger.info("Regeneration complete!")
 
 
 if __name__ == "__main__":
@@ -552,6 +728,22 @@ if __name__ == "__main__":
     parser.add_argument("job_id", help="Job ID")
     parser.add_argument("variation_type", help="Shot type to regenerate")
     parser.add_argument("output_dir", help="Output directory path")
+    parser.add_argument(
+        "--batch-verify",
+        action="store_true",
+        help="Score each round of exterior candidates in one vision call"
+    )
+    parser.add_argument(
+        "--draft",
+        action="store_true",
+        help="Try one round from the cheaper draft model once a shot is close to passing"
+    )
 
     args = parser.parse_args()
-    main(args.job_id, args.variation_type, args.output_dir)
+    event_loop.run(main(
+        args.job_id,
+        args.variation_type,
+        args.output_dir,
+        batch_verify=args.batch_verify,
+        draft=args.draft
+    ))
@@ -0,0 +1,41 @@
+"""
+Buffered, job-tagged logging for the pipeline scripts.
+
+Every script logs through the "sqm" logger. configure_logging sends it to
+stdout through a 32-record buffer that tags each line with the job id;
+WARNING and above flush the buffer, flush_logs writes it out on demand, and
+the rest is written out at exit.
+"""
+
+import logging
+import logging.handlers
+import sys
+from typing import Optional
+
+logger = logging.getLogger("sqm")
+logger.setLevel(logging.INFO)
+
+_log_buffer: Optional[logging.handlers.MemoryHandler] = None
+
+
+def configure_logging(job_id: str):
+    """Send the sqm logger to stdout through a 32-record buffer tagged with the job id."""
+    global _log_buffer
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("[%(job_id)s] %(message)s"))
+
+    _log_buffer = logging.handlers.MemoryHandler(32, flushLevel=logging.WARNING, target=stream)
+
+    def add_job_id(record: logging.LogRecord) -> bool:
+        record.job_id = job_id
+        return True
+
+    _log_buffer.addFilter(add_job_id)
+    logger.addHandler(_log_buffer)
+    logger.propagate = False
+
+
+def flush_logs():
+    """Write out buffered log records."""
+    if _log_buffer is not None:
+        _log_buffer.flush()
@@ -0,0 +1,60 @@
+"""Tests for the regeneration loop in regenerate_single.py."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("google.genai")
+pytest.importorskip("dotenv")
+pytest.importorskip("tenacity")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# The shared client is created at import; no request is sent
+os.environ.setdefault("GOOGLE_AI_API_KEY", "test")
+
+import regenerate_single  # noqa: E402
+
+
+def test_draft_model_runs_with_default_round_size(tmp_path, monkeypatch):
+    """With --draft and the default round size, a shot close to passing gets a draft round."""
+    (tmp_path / "hero.png").write_bytes(b"hero")
+    (tmp_path / "manifest.json").write_text(json.dumps({
+        "parsed": {},
+        "images": [{"filename": "hero.png", "isHero": True}],
+    }))
+
+    models = []
+
+    async def fake_generate_image(prompt, reference_part=None, aspect_ratio="16:9", model=regenerate_single.IMAGE_MODEL):
+        models.append(model)
+        return regenerate_single.types.Blob(data=b"image", mime_type="image/png")
+
+    async def fake_verify_image(hero_part, generated_part, shot_type):
+        return {
+            "total_score": regenerate_single.DRAFT_MIN_SCORE,
+            "breakdown": {},
+            "issues": [],
+            "suggestions": [],
+        }
+
+    async def fake_describe_hero_image(hero_part, cache_dir=None):
+        return "Modern residential building"
+
+    monkeypatch.setattr(regenerate_single, "MAX_REGEN_ATTEMPTS", 3)
+    monkeypatch.setattr(regenerate_single, "REGEN_CANDIDATES_PER_ROUND", 3)
+    monkeypatch.setattr(regenerate_single, "generate_image", fake_generate_image)
+    monkeypatch.setattr(regenerate_single, "verify_image", fake_verify_image)
+    monkeypatch.setattr(regenerate_single, "describe_hero_image", fake_describe_hero_image)
+
+    async def run():
+        regenerator = regenerate_single.BatchRegenerator("job", str(tmp_path), draft=True)
+        async with regenerator.store:
+            return await regenerator.regenerate("context_street")
+
+    assert asyncio.run(run())
+    assert models[0] == regenerate_single.IMAGE_MODEL
+    assert regenerate_single.DRAFT_IMAGE_MODEL in models
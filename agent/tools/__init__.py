@@ -1,14 +0,0 @@
-"""
-Custom tools for the SQM Project Images Generator agent.
-"""
-
-from .gemini_image import gemini_generate_image
-from .verify_consistency import verify_consistency
-from .storage import store_image, update_job_status
-
-__all__ = [
-    "gemini_generate_image",
-    "verify_consistency",
-    "store_image",
-    "update_job_status"
-]
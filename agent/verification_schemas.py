@@ -0,0 +1,67 @@
+"""
+Response schemas for the vision verifiers.
+
+Passing these as response_schema makes Gemini return JSON in exactly this
+shape, which the SDK decodes into response.parsed, so verifiers don't need
+to clean up fenced or prose-wrapped output.
+"""
+
+from google.genai import types
+
+EXTERIOR_CRITERIA = (
+    "building_shape",
+    "architectural_style",
+    "materials_facade",
+    "windows_openings",
+    "proportions",
+)
+
+INTERIOR_CRITERIA = (
+    "interior_style_consistency",
+    "material_finish_quality",
+    "lighting_appropriateness",
+    "spatial_quality",
+    "project_context_match",
+)
+
+_STRING_LIST = types.Schema(type=types.Type.ARRAY, items=types.Schema(type=types.Type.STRING))
+
+
+def _verification_schema(criteria) -> types.Schema:
+    return types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "total_score": types.Schema(type=types.Type.INTEGER),
+            "breakdown": types.Schema(
+                type=types.Type.OBJECT,
+                properties={criterion: types.Schema(type=types.Type.INTEGER) for criterion in criteria},
+                required=list(criteria),
+            ),
+            "issues": _STRING_LIST,
+            "suggestions": _STRING_LIST,
+        },
+        required=["total_score", "breakdown", "issues", "suggestions"],
+    )
+
+
+EXTERIOR_VERIFICATION_SCHEMA = _verification_schema(EXTERIOR_CRITERIA)
+INTERIOR_VERIFICATION_SCHEMA = _verification_schema(INTERIOR_CRITERIA)
+
+# One exterior score per candidate, in image order
+BATCH_VERIFICATION_SCHEMA = types.Schema(
+    type=types.Type.OBJECT,
+    properties={
+        "scores": types.Schema(
+            type=types.Type.ARRAY,
+            items=types.Schema(
+                type=types.Type.OBJECT,
+                properties={
+                    "shot_type": types.Schema(type=types.Type.STRING),
+                    **EXTERIOR_VERIFICATION_SCHEMA.properties,
+                },
+                required=["shot_type", *EXTERIOR_VERIFICATION_SCHEMA.required],
+            ),
+        ),
+    },
+    required=["scores"],
+)